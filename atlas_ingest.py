@@ -0,0 +1,199 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+from atlas_store import AtlasWriter
+from compass_functions import time_parts, time_atlas
+
+# =============================================================================
+# Chunked Table Readers
+# =============================================================================
+# Tabular time series (CSV, Parquet or XLSX files, or any iterable of
+# DataFrames) are read a bounded number of rows at a time, so files larger
+# than memory can be mapped onto a time atlas and written to an appendable
+# atlas store (``atlas_store.AtlasWriter``) as they are read.
+
+TABLE_FORMATS = ('csv', 'parquet', 'xlsx')
+
+def table_format(source):
+    """Format of a table file from its extension ('csv', 'parquet' or 'xlsx')."""
+    ext = os.path.splitext(source)[1].lower().lstrip('.')
+    fmt = {'txt': 'csv', 'tsv': 'csv', 'pq': 'parquet', 'xlsm': 'xlsx'}.get(ext, ext)
+    if fmt not in TABLE_FORMATS:
+        raise ValueError(f"unsupported table format '{ext}', expected one of {TABLE_FORMATS}")
+    return fmt
+
+def _iter_xlsx(source, columns=None, chunk_size=2**16, sheet_name=0, header=0):
+    # openpyxl's read-only mode streams rows from the sheet XML instead of
+    # loading the workbook, unlike pandas.read_excel.
+    from openpyxl import load_workbook
+    workbook = load_workbook(source, read_only=True, data_only=True)
+    try:
+        sheet = workbook.worksheets[sheet_name] if isinstance(sheet_name, int) else workbook[sheet_name]
+        rows = sheet.iter_rows(min_row=header + 1, values_only=True)
+        names = next(rows, None)
+        if names is None:
+            return
+        block = []
+        for row in rows:
+            block.append(row)
+            if len(block) == chunk_size:
+                yield pd.DataFrame(block, columns=names, copy=False)[columns or list(names)]
+                block = []
+        if block:
+            yield pd.DataFrame(block, columns=names, copy=False)[columns or list(names)]
+    finally:
+        workbook.close()
+
+def iter_table(source, columns=None, chunk_size=2**16, fmt=None, **read_kw):
+    """
+    Read a table as a sequence of DataFrames of at most ``chunk_size`` rows.
+
+    Parameters
+    ----------
+    source : str or iterable of DataFrame
+        Path of a CSV, Parquet or XLSX file, or chunks already being read
+        (e.g. from ``pd.read_sql(..., chunksize=...)``), yielded as they are.
+    columns : list of str, optional
+        Columns to read (default: all).
+    chunk_size : int
+        Rows per chunk.
+    fmt : str, optional
+        File format (default: from the file extension, see ``table_format``).
+    **read_kw :
+        Passed to ``pd.read_csv`` (e.g. ``sep``, ``skiprows``), to
+        ``pyarrow.parquet.ParquetFile.iter_batches``, or, for XLSX, the
+        ``sheet_name`` (index or name) and the 0-based ``header`` row.
+
+    Parquet requires the optional pyarrow package and XLSX the optional
+    openpyxl package.
+    """
+    if not isinstance(source, (str, os.PathLike)):
+        yield from source
+        return
+    fmt = fmt or table_format(source)
+    if fmt == 'csv':
+        with pd.read_csv(source, usecols=columns, chunksize=chunk_size, **read_kw) as reader:
+            yield from reader
+    elif fmt == 'parquet':
+        import pyarrow.parquet as pq
+        for batch in pq.ParquetFile(source).iter_batches(batch_size=chunk_size, columns=columns, **read_kw):
+            yield batch.to_pandas()
+    else:
+        yield from _iter_xlsx(source, columns, chunk_size, **read_kw)
+
+# =============================================================================
+# Typed Arrays and Streaming Ingestion
+# =============================================================================
+def chunk_arrays(chunk, time_column=None, value_columns=None, levels=('month', 'day', 'hour'),
+                 time_format=None, dayfirst=False, values_dtype=np.float32):
+    """
+    Convert a DataFrame chunk to compact typed arrays.
+
+    Parameters
+    ----------
+    chunk : DataFrame
+        Rows of the table.
+    time_column : str, optional
+        Column (or named index) with the timestamps (default: the index).
+    value_columns : list of str, optional
+        Numeric columns to keep (default: every column but ``time_column``).
+    levels : sequence of str
+        Calendar fields to extract (see ``compass_functions.time_parts``).
+    time_format, dayfirst :
+        Timestamp parsing options for ``pd.to_datetime``.
+    values_dtype : dtype
+        Dtype of the values block.
+
+    Returns
+    -------
+    index : DatetimeIndex
+    parts : dict of ndarray of int32
+        One array per level.
+    values : ndarray, shape (n, len(value_columns))
+        All value columns converted in a single block copy.
+    """
+    if time_column is None or (time_column not in chunk.columns and time_column == chunk.index.name):
+        # Parquet files written from pandas restore their index as the index.
+        times = chunk.index
+        if isinstance(times, pd.RangeIndex):
+            raise ValueError("the table has no time index; pass time_column (or index_col when reading a CSV)")
+    else:
+        times = chunk[time_column]
+    index = pd.DatetimeIndex(pd.to_datetime(times, format=time_format, dayfirst=dayfirst))
+    if value_columns is None:
+        value_columns = [c for c in chunk.columns if c != time_column]
+    values = chunk[list(value_columns)].to_numpy(dtype=values_dtype)
+    return index, time_parts(index, levels), values
+
+def ingest_table(source, path, time_column=None, value_columns=None, levels=('month', 'day', 'hour'),
+                 radii=1, periods=None, chunk_size=2**16, time_format=None, dayfirst=False,
+                 values_dtype=np.float32, atlas_dtype=np.complex128, meta=None, **read_kw):
+    """
+    Stream a table into an on-disk time atlas, one chunk at a time.
+
+    Every chunk is read (``iter_table``), converted to typed arrays
+    (``chunk_arrays``), mapped onto the calendar dials with
+    ``compass_functions.time_atlas`` and appended to the atlas at ``path``,
+    which is flushed after each chunk so it can be opened (``open_atlas``)
+    while the ingestion runs. Memory use is bounded by ``chunk_size``.
+
+    Parameters
+    ----------
+    source : str or iterable of DataFrame
+        Table to read, see ``iter_table``.
+    path : str
+        Atlas directory. It holds one int32 array per level, the values
+        (n, len(value_columns)) and the complex ``atlas`` positions.
+    time_column, value_columns, time_format, dayfirst, values_dtype :
+        See ``chunk_arrays``. Without ``time_column`` every column is read,
+        so the index of the file (e.g. ``index_col`` for a CSV) is kept.
+    levels, radii, periods :
+        Dials of the atlas, see ``compass_functions.time_atlas``. Chunks are
+        mapped independently, so a 'year' level needs an explicit
+        ``periods['year']`` (its default depends on the rows seen).
+    chunk_size : int
+        Rows per chunk.
+    atlas_dtype : dtype
+        Dtype of the stored atlas positions (e.g. ``np.complex64``).
+    meta : dict, optional
+        Extra parameters stored in the atlas header.
+    **read_kw :
+        File reading options, see ``iter_table``.
+
+    Returns
+    -------
+    rows : int
+        Number of rows written.
+    """
+    levels = tuple(levels)
+    if 'year' in levels and 'year' not in (periods or {}):
+        raise ValueError("streaming a 'year' level requires periods['year']")
+    # Only a named time column can be added to the columns read: without one
+    # the times are the file's index, which a column selection would drop.
+    columns = None
+    if value_columns is not None and time_column is not None:
+        columns = list(value_columns) + [time_column]
+    header = {"kind": "time_atlas", "levels": list(levels), "periods": periods or {},
+              "radii": radii if isinstance(radii, dict) else np.broadcast_to(radii, len(levels)).tolist(),
+              **(meta or {})}
+    writer = None
+    try:
+        for chunk in iter_table(source, columns, chunk_size, **read_kw):
+            index, parts, values = chunk_arrays(chunk, time_column, value_columns, levels,
+                                                time_format, dayfirst, values_dtype)
+            if writer is None:
+                if value_columns is None:
+                    value_columns = [c for c in chunk.columns if c != time_column]
+                header["value_columns"] = [str(c) for c in value_columns]
+                specs = {level: ((), np.int32) for level in levels}
+                specs.update(values=((values.shape[1],), values_dtype), atlas=((), atlas_dtype))
+                writer = AtlasWriter(path, specs, header)
+            atlas = time_atlas(index, levels, radii, periods, parts, atlas_dtype)
+            writer.append(values=values, atlas=atlas, **parts)
+            writer.flush()
+    finally:
+        if writer is not None:
+            writer.close()
+    return 0 if writer is None else writer.rows
@@ -0,0 +1,309 @@
+import numpy as np
+import matplotlib.pyplot as plt
+
+from atom import iter_carrier, stack_carrier, apply_transforms, TRANSFORM_MATRICES
+from colormap_tables import colormap_lut
+
+# =============================================================================
+# Raster Aggregation of Massive Atlases
+# =============================================================================
+# Instead of one vector marker per point, points are binned into a fixed
+# (height, width) pixel grid: every pixel accumulates the number of points
+# falling in it and a blend of their colors. The grid is then shaded into an
+# RGBA image. Accumulation is a handful of np.bincount / ufunc.at passes, so
+# the cost of the image only depends on the number of pixels, and point sets
+# of any size can be streamed through ``accumulate`` chunk by chunk.
+#
+# Color blending modes ('how'):
+#
+# - 'add'  : colors add up like light; each pixel's summed color is scaled by
+#            its brightness relative to the brightest pixel (log-scaled with
+#            ``log=True``), which keeps its hue.
+# - 'mean' : the average color of the points in each pixel.
+# - 'max'  : the per-channel maximum color of the points in each pixel.
+#
+# In every mode the pixel opacity follows the point density (log1p-scaled
+# with ``log=True``), so empty pixels stay transparent.
+
+BLEND_MODES = ('add', 'mean', 'max')
+
+def _widen(lo, hi, padding=0.0):
+    # Padded (lo, hi) of one axis; a zero-width range (a single point, or
+    # points sharing a coordinate) is widened so that it has pixels.
+    lo, hi = float(lo) - padding, float(hi) + padding
+    if hi <= lo:
+        eps = 1e-6 * max(abs(lo), 1.0)
+        lo, hi = lo - eps, hi + eps
+    return lo, hi
+
+def raster_extent(x, y, padding=0.0):
+    """
+    (xmin, xmax, ymin, ymax) of the points, widened by ``padding``.
+
+    An axis with zero width is widened by a small epsilon around its value.
+    """
+    return _widen(np.min(x), np.max(x), padding) + _widen(np.min(y), np.max(y), padding)
+
+def pixel_index(x, y, shape, extent):
+    """
+    Flat pixel index of every point inside ``extent``.
+
+    Row 0 is the top of the image (largest y), like ``imshow(origin='upper')``.
+
+    Returns
+    -------
+    index : ndarray of int64
+        ``row * width + column`` of the points inside the extent.
+    inside : ndarray of bool
+        Which points fall inside the extent.
+    """
+    height, width = shape
+    xmin, xmax, ymin, ymax = extent
+    x = np.asarray(x)
+    y = np.asarray(y)
+    inside = (x >= xmin) & (x <= xmax) & (y >= ymin) & (y <= ymax)
+    x = x[inside]
+    y = y[inside]
+    # Points exactly on the upper edges go into the last column/row; a
+    # zero-width extent puts every point in the first one.
+    x_scale = width / (xmax - xmin) if xmax > xmin else 0.0
+    y_scale = height / (ymax - ymin) if ymax > ymin else 0.0
+    col = np.minimum(((x - xmin) * x_scale).astype(np.int64), width - 1)
+    row = np.minimum(((ymax - y) * y_scale).astype(np.int64), height - 1)
+    return row * width + col, inside
+
+def accumulate(x, y, shape, extent, colors=None, how='add', counts=None, totals=None, palette=None):
+    """
+    Bin points into a pixel grid, adding to existing accumulators if given.
+
+    Parameters
+    ----------
+    x, y : ndarray
+        Point coordinates.
+    shape : (int, int)
+        Grid height and width in pixels.
+    extent : (float, float, float, float)
+        (xmin, xmax, ymin, ymax) covered by the grid; points outside are
+        dropped.
+    colors : ndarray, shape (N, 3) or (N, 4), optional
+        RGB(A) color of every point; only RGB is blended. Without colors only
+        the density is accumulated.
+    how : str
+        'add', 'mean' or 'max' (see module notes).
+    counts : ndarray, shape (height, width), optional
+        Point counts to add to (e.g. from a previous chunk).
+    totals : ndarray, shape (height, width, 3), optional
+        Color accumulator to add to; color sums for 'add' and 'mean',
+        per-channel maxima for 'max'.
+    palette : ndarray, shape (M, 3) or (M, 4), optional
+        Color table; ``colors`` are then integer indices into it, shape (N,),
+        and the per-point colors are looked up one channel at a time.
+
+    Returns
+    -------
+    counts : ndarray of int64, shape (height, width)
+    totals : ndarray of float64, shape (height, width, 3), or None
+    """
+    if how not in BLEND_MODES:
+        raise ValueError(f"Unknown blend mode: {how!r}")
+    height, width = shape
+    if counts is None:
+        counts = np.zeros(shape, dtype=np.int64)
+    if totals is None and colors is not None:
+        totals = np.zeros((height, width, 3))
+    index, inside = pixel_index(x, y, shape, extent)
+    counts += np.bincount(index, minlength=height * width).reshape(shape)
+    if colors is not None:
+        colors = np.asarray(colors)[inside]
+        flat = totals.reshape(-1, 3)
+        for c in range(3):
+            channel = colors[:, c] if palette is None else palette[colors, c]
+            if how == 'max':
+                np.maximum.at(flat[:, c], index, channel)
+            else:
+                flat[:, c] += np.bincount(index, weights=channel, minlength=height * width)
+    return counts, totals
+
+def shade(counts, totals=None, how='add', log=True, cmap='viridis'):
+    """
+    Turn accumulated counts (and colors) into an RGBA image.
+
+    Parameters
+    ----------
+    counts : ndarray, shape (height, width)
+        Point counts from ``accumulate``.
+    totals : ndarray, shape (height, width, 3), optional
+        Color accumulator from ``accumulate``. Without it, pixels are colored
+        by density through ``cmap``.
+    how : str
+        Blend mode used when accumulating.
+    log : bool
+        Log-scale the density (and the summed colors for 'add').
+    cmap : str or Colormap
+        Colormap for density-only images.
+
+    Returns
+    -------
+    image : ndarray of float64, shape (height, width, 4)
+        RGBA in [0, 1]; empty pixels are fully transparent.
+    """
+    density = np.log1p(counts) if log else counts.astype(np.float64)
+    peak = density.max()
+    density = density / peak if peak > 0 else density
+    filled = counts > 0
+    if totals is None:
+        image = plt.get_cmap(cmap)(density)
+    else:
+        image = np.zeros(counts.shape + (4,))
+        if how == 'add':
+            # Tone-map by the brightest channel of each pixel, keeping its hue.
+            level = totals.max(axis=-1)
+            scaled = np.log1p(level) if log else level
+            peak = scaled.max()
+            gain = np.divide(scaled, level * peak, out=np.zeros_like(level), where=level > 0)
+            image[..., :3] = totals * gain[..., None]
+        elif how == 'mean':
+            image[filled, :3] = totals[filled] / counts[filled, None]
+        else:
+            image[..., :3] = totals
+    image[..., 3] = np.where(filled, density, 0.0)
+    return image
+
+def rasterize(x, y, shape=(1024, 1024), extent=None, colors=None, how='add', log=True,
+              cmap='viridis', padding=0.0, chunk_size=2**22):
+    """
+    Rasterize a point set into an RGBA image.
+
+    Parameters
+    ----------
+    x, y : ndarray
+        Point coordinates (may be memmaps; they are read ``chunk_size``
+        points at a time).
+    shape, colors, how :
+        See ``accumulate``.
+    extent : (float, float, float, float), optional
+        Region to draw (default: the bounds of the points plus ``padding``).
+    log, cmap :
+        See ``shade``.
+    padding : float
+        Margin added around the automatic extent.
+    chunk_size : int
+        Points binned per pass.
+
+    Returns
+    -------
+    image : ndarray, shape (height, width, 4)
+    extent : (float, float, float, float)
+    """
+    if extent is None:
+        extent = raster_extent(x, y, padding)
+    counts = totals = None
+    for lo in range(0, len(x), chunk_size):
+        hi = lo + chunk_size
+        counts, totals = accumulate(x[lo:hi], y[lo:hi], shape, extent,
+                                    None if colors is None else colors[lo:hi], how, counts, totals)
+    if counts is None:
+        counts = np.zeros(shape, dtype=np.int64)
+    return shade(counts, totals, how, log, cmap), extent
+
+def show_raster(image, extent, ax=None, **kwargs):
+    """Draw a raster image on ``ax`` (default: the current axes) in data coordinates."""
+    ax = ax or plt.gca()
+    return ax.imshow(image, extent=extent, origin='upper', interpolation='nearest', **kwargs)
+
+# =============================================================================
+# Atlases and Atoms
+# =============================================================================
+def raster_atlas(atlas, symbol=None, cmap='hsv', shape=(1024, 1024), extent=None, how='mean',
+                 log=True, padding=0.0, chunk_size=2**22):
+    """
+    Rasterize a complex atlas (e.g. ``compass(r, T, s)``).
+
+    Points are colored like ``compass_functions.get_colors``: ``symbol`` is
+    normalized to its range and mapped through ``cmap``. Without ``symbol``
+    the image shows the density through ``cmap``.
+
+    Returns
+    -------
+    image : ndarray, shape (height, width, 4)
+    extent : (float, float, float, float)
+    """
+    atlas = np.asarray(atlas)
+    x, y = atlas.real, atlas.imag
+    if extent is None:
+        extent = raster_extent(x, y, padding)
+    if symbol is None:
+        return rasterize(x, y, shape, extent, None, how, log, cmap, chunk_size=chunk_size)
+    symbol = np.asarray(symbol)
+    norm = plt.Normalize(np.min(symbol), np.max(symbol))
+    colormap = plt.get_cmap(cmap)
+    counts = totals = None
+    for lo in range(0, len(atlas), chunk_size):
+        hi = lo + chunk_size
+        counts, totals = accumulate(x[lo:hi], y[lo:hi], shape, extent, colormap(norm(symbol[lo:hi])),
+                                    how, counts, totals)
+    if counts is None:
+        counts = np.zeros(shape, dtype=np.int64)
+    return shade(counts, totals, how, log), extent
+
+def raster_carrier(N, M_c, D=4, matrices=None, projection=None, shape=(1024, 1024), extent=None,
+                   how='add', log=True, cmap_name='hsv', padding=0.0, chunk_size=2**20):
+    """
+    Rasterize the transformed atom curves of an N-point carrier.
+
+    The carrier is streamed with ``atom.iter_carrier`` and every chunk is
+    transformed, projected and binned before the next one is generated, so
+    memory stays bounded by ``chunk_size`` and N can reach ~10^8. Points
+    carry their color as an index into the M_c-color table.
+
+    Parameters
+    ----------
+    N, D :
+        Carrier length and dimension, see ``atom.compute_carrier``.
+    M_c : int
+        Points are colored by n mod M_c, like ``atom.get_colors``.
+    matrices : ndarray, shape (K, 3, 3), optional
+        Transforms to draw (default: all 48, see ``atom.select_transforms``).
+    projection : ndarray, shape (3, 2), optional
+        Linear map from 3D points to image (x, y) (default: drop z).
+    extent : (float, float, float, float), optional
+        Region to draw. When omitted the carrier is streamed twice, once to
+        find the bounds of the projected points.
+    shape, how, log, padding :
+        See ``rasterize``.
+    cmap_name : str
+        Colormap sampled into M_c colors.
+    chunk_size : int
+        Projected points (carrier points times transforms) binned per pass.
+
+    Returns
+    -------
+    image : ndarray, shape (height, width, 4)
+    extent : (float, float, float, float)
+    """
+    if projection is None:
+        projection = np.eye(3, 2)
+    K = len(TRANSFORM_MATRICES if matrices is None else matrices)
+    lut = colormap_lut(cmap_name, M_c)
+    code_dtype = np.min_scalar_type(max(M_c - 1, 0))
+
+    def projected_chunks():
+        # Each carrier point fans out to K projected points, curve by curve.
+        for n, u, v, w, gamma in iter_carrier(N, D, chunk_size=max(1, chunk_size // max(K, 1))):
+            points = apply_transforms(stack_carrier(u, v, w), matrices) @ projection
+            yield n, points.reshape(-1, 2)
+
+    if extent is None:
+        lo = np.zeros(2)
+        hi = np.zeros(2)
+        for i, (n, points) in enumerate(projected_chunks()):
+            lo = points.min(axis=0) if i == 0 else np.minimum(lo, points.min(axis=0))
+            hi = points.max(axis=0) if i == 0 else np.maximum(hi, points.max(axis=0))
+        extent = _widen(lo[0], hi[0], padding) + _widen(lo[1], hi[1], padding)
+    counts = totals = None
+    for n, points in projected_chunks():
+        codes = np.tile((n % M_c).astype(code_dtype), K)
+        counts, totals = accumulate(points[:, 0], points[:, 1], shape, extent, codes, how, counts, totals, lut)
+    if counts is None:
+        counts = np.zeros(shape, dtype=np.int64)
+    return shade(counts, totals, how, log), extent
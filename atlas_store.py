@@ -0,0 +1,245 @@
+import json
+import os
+import struct
+
+import numpy as np
+from numpy.lib.format import open_memmap
+
+from atom import iter_carrier, stack_carrier, apply_transforms, TRANSFORM_MATRICES, COMPACT_DTYPES
+
+# =============================================================================
+# On-disk Atlas Store
+# =============================================================================
+# An atlas is a directory holding one .npy file per array plus a small
+# "atlas.json" header with the parameters and the list of arrays. Arrays are
+# reopened with np.memmap (through np.load(mmap_mode=...)), so re-renders start
+# instantly and multi-gigabyte atlases can be browsed without loading them.
+
+HEADER_FILE = "atlas.json"
+
+def _array_path(path, name):
+    return os.path.join(path, name + ".npy")
+
+def _write_header(path, meta, arrays):
+    header = {"meta": meta,
+              "arrays": {name: {"dtype": str(arr.dtype), "shape": list(arr.shape)}
+                         for name, arr in arrays.items()}}
+    with open(os.path.join(path, HEADER_FILE), "w") as f:
+        json.dump(header, f, indent=1)
+
+def read_header(path):
+    with open(os.path.join(path, HEADER_FILE)) as f:
+        return json.load(f)
+
+def create_atlas(path, specs, meta=None):
+    """
+    Create an empty atlas on disk and return writable memmaps.
+
+    Parameters
+    ----------
+    path : str
+        Atlas directory (created if missing).
+    specs : dict
+        ``{name: (shape, dtype)}`` for each array.
+    meta : dict, optional
+        JSON-serializable parameters stored in the header.
+
+    Returns
+    -------
+    arrays : dict of np.memmap
+        Writable arrays; call ``flush()`` on them (or drop them) when done.
+    """
+    os.makedirs(path, exist_ok=True)
+    arrays = {name: open_memmap(_array_path(path, name), mode="w+", dtype=dtype, shape=tuple(shape))
+              for name, (shape, dtype) in specs.items()}
+    _write_header(path, meta or {}, arrays)
+    return arrays
+
+def save_atlas(path, arrays, meta=None):
+    """Write in-memory arrays as an atlas (see ``open_atlas``)."""
+    out = create_atlas(path, {name: (np.shape(arr), np.asarray(arr).dtype) for name, arr in arrays.items()}, meta)
+    for name, arr in arrays.items():
+        out[name][...] = arr
+        out[name].flush()
+    return out
+
+def open_atlas(path, mode="r"):
+    """
+    Reopen an atlas without loading it into memory.
+
+    Parameters
+    ----------
+    path : str
+        Atlas directory.
+    mode : str
+        Memmap mode: 'r' (read-only), 'r+' (read/write) or 'c' (copy-on-write).
+
+    Returns
+    -------
+    arrays : dict of np.memmap
+    meta : dict
+    """
+    header = read_header(path)
+    arrays = {name: np.load(_array_path(path, name), mmap_mode=mode) for name in header["arrays"]}
+    return arrays, header["meta"]
+
+# =============================================================================
+# Appendable Atlases
+# =============================================================================
+# Streams of unknown length are written as plain .npy files whose first axis
+# grows: rows are appended as raw bytes after a header reserved for the
+# largest possible row count, and the header is rewritten with the actual
+# count on every flush. The files stay valid .npy (and the atlas valid for
+# ``open_atlas``) after each flush, so a partial result can already be opened.
+
+_MAX_ROWS = 2 ** 63 - 1
+
+def _npy_header(dtype, shape, size=None):
+    # .npy version 1.0 header, padded with spaces to ``size`` bytes.
+    # Magic string, 2 version bytes, 2 length bytes, then the dict and "\n".
+    prefix = len(np.lib.format.MAGIC_PREFIX) + 4
+    header = repr({"descr": np.lib.format.dtype_to_descr(dtype), "fortran_order": False, "shape": tuple(shape)})
+    if size is None:
+        size = -(-(prefix + len(header) + 1) // 64) * 64
+    header = header.ljust(size - prefix - 1) + "\n"
+    return np.lib.format.MAGIC_PREFIX + bytes((1, 0)) + struct.pack("<H", len(header)) + header.encode("latin1")
+
+class AtlasWriter:
+    """
+    Atlas whose arrays grow along their first axis as chunks are appended.
+
+    Parameters
+    ----------
+    path : str
+        Atlas directory (created if missing; existing arrays are replaced).
+    specs : dict
+        ``{name: (row_shape, dtype)}`` for each array; an array of ``n`` rows
+        has shape ``(n,) + row_shape``.
+    meta : dict, optional
+        JSON-serializable parameters stored in the header. ``self.meta`` can
+        be updated before the next flush.
+    """
+
+    def __init__(self, path, specs, meta=None):
+        os.makedirs(path, exist_ok=True)
+        self.path = path
+        self.meta = dict(meta or {})
+        self.rows = 0
+        self._specs = {name: (tuple(row_shape), np.dtype(dtype)) for name, (row_shape, dtype) in specs.items()}
+        self._files = {}
+        self._header_sizes = {}
+        for name, (row_shape, dtype) in self._specs.items():
+            self._header_sizes[name] = len(_npy_header(dtype, (_MAX_ROWS,) + row_shape))
+            self._files[name] = open(_array_path(path, name), "wb")
+        self.flush()
+
+    def append(self, **chunk):
+        """
+        Append the same number of rows to every array.
+
+        Parameters
+        ----------
+        **chunk : array_like
+            One value per array, of shape ``(n,) + row_shape``; values are
+            cast to the array dtype and written without further copies when
+            they already match it.
+        """
+        if set(chunk) != set(self._specs):
+            raise ValueError(f"expected arrays {sorted(self._specs)}, got {sorted(chunk)}")
+        rows = None
+        for name, (row_shape, dtype) in self._specs.items():
+            values = np.ascontiguousarray(chunk[name], dtype=dtype)
+            if values.shape[1:] != row_shape or (rows is not None and len(values) != rows):
+                raise ValueError(f"array '{name}' has shape {values.shape}, expected ({rows}, *{row_shape})")
+            rows = len(values)
+            chunk[name] = values
+        for name, values in chunk.items():
+            self._files[name].write(memoryview(values).cast("B"))
+        self.rows += rows
+
+    def flush(self):
+        """Write the current row count to every header so the atlas can be opened."""
+        for name, (row_shape, dtype) in self._specs.items():
+            f = self._files[name]
+            f.seek(0)
+            f.write(_npy_header(dtype, (self.rows,) + row_shape, self._header_sizes[name]))
+            f.seek(0, os.SEEK_END)
+            f.flush()
+        shapes = {name: np.broadcast_to(np.zeros((), dtype), (self.rows,) + row_shape)
+                  for name, (row_shape, dtype) in self._specs.items()}
+        _write_header(self.path, self.meta, shapes)
+
+    def close(self):
+        self.flush()
+        for f in self._files.values():
+            f.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+# =============================================================================
+# Carriers and Transformed Curves
+# =============================================================================
+def save_carrier(path, N, D=4, method='direct', anchor_every=1024,
+                 with_curves=True, chunk_size=2**20, compact=False):
+    """
+    Stream a carrier (and optionally its 48 transformed curves) to disk.
+
+    The carrier is generated chunk by chunk with ``atom.iter_carrier``, so
+    memory use is bounded by ``chunk_size`` regardless of N.
+
+    Parameters
+    ----------
+    path : str
+        Atlas directory.
+    N, D, method, anchor_every :
+        Carrier parameters, see ``atom.compute_carrier``.
+    with_curves : bool
+        Also store the (48, N, 3) transformed curves.
+    chunk_size : int
+        Points generated and written per step.
+    compact : bool
+        Store int32/float32/complex64 arrays and float32 curves at half the
+        size (see ``atom.to_compact`` for the precision).
+    """
+    if compact:
+        dtypes = dict(COMPACT_DTYPES, n_array=np.int32 if N <= 2**31 else np.int64)
+    else:
+        dtypes = {"n_array": np.int64, "u": np.float64, "v": np.float64, "w": np.float64, "gamma": np.complex128}
+    specs = {name: ((N,), dtype) for name, dtype in dtypes.items()}
+    if with_curves:
+        specs["curves"] = ((len(TRANSFORM_MATRICES), N, 3), dtypes["u"])
+    meta = {"kind": "carrier", "N": N, "D": D, "method": method, "anchor_every": anchor_every,
+            "compact": compact}
+    arrays = create_atlas(path, specs, meta)
+    for n, u, v, w, gamma in iter_carrier(N, D, chunk_size=chunk_size, method=method, anchor_every=anchor_every,
+                                          compact=compact):
+        lo, hi = n[0], n[-1] + 1
+        for name, values in zip(("n_array", "u", "v", "w", "gamma"), (n, u, v, w, gamma)):
+            arrays[name][lo:hi] = values
+        if with_curves:
+            apply_transforms(stack_carrier(u, v, w), out=arrays["curves"][:, lo:hi, :])
+    for arr in arrays.values():
+        arr.flush()
+    return arrays
+
+def load_carrier(path, mode="r"):
+    """
+    Reopen a stored carrier as memmaps.
+
+    Returns
+    -------
+    carrier : tuple
+        ``(n_array, u, v, w, gamma, alpha, beta)`` like ``compute_carrier``;
+        alpha and beta are the same memmaps as u and v (gamma = alpha + i beta).
+    curves : np.memmap or None
+        The stored (48, N, 3) curves, ready for ``plot_atom(..., curves=curves)``.
+    meta : dict
+    """
+    arrays, meta = open_atlas(path, mode)
+    u, v = arrays["u"], arrays["v"]
+    carrier = (arrays["n_array"], u, v, arrays["w"], arrays["gamma"], u, v)
+    return carrier, arrays.get("curves"), meta
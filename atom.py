@@ -1,9 +1,14 @@
+from collections import OrderedDict
+from functools import partial
+
 import numpy as np
 import matplotlib.pyplot as plt
-from matplotlib.animation import FuncAnimation, FFMpegWriter
+from matplotlib.animation import FuncAnimation
 from mpl_toolkits.mplot3d.art3d import Line3DCollection
-import matplotlib as mpl
-from mpl_toolkits.mplot3d import Axes3D  # registers 3D projection
+
+from colormap_tables import colormap_lut
+from level_of_detail import DetailPyramid, pixel_cells
+from video_export import save_scene
 
 # =============================================================================
 # Enforce a pure black background (dark style)
@@ -28,7 +33,7 @@ plt.rcParams.update({
 # =============================================================================
 # Compute the Carrier using the Toy-Universe Formulas
 # =============================================================================
-def compute_carrier(N, D=4):
+def compute_carrier(N, D=4, method='direct', anchor_every=1024, compact=False):
     r"""
     Computes the carrier (time wave) for a 4D toy universe with:
     
@@ -74,32 +79,254 @@ def compute_carrier(N, D=4):
       \[
       u_n=\Re(\gamma_n),\quad v_n=\Im(\gamma_n),\quad w_n=\log_2\bigl(|\gamma_n|\bigr).
       \]
+
+    With ``method='recurrence'`` the phase \(e^{-i\Omega(n+1)}\) is advanced
+    by one complex multiplication per step instead of one ``exp`` per point,
+    and re-anchored to the exact ``exp`` value every ``anchor_every`` indices.
+    Against the direct evaluation the phase differs by at most about
+    \[
+    \varepsilon\,\bigl(4\,\mathrm{anchor\_every} + \Omega N\bigr),
+    \qquad \varepsilon = 2.2\times10^{-16},
+    \]
+    where the first term is the accumulated rounding of the multiplications
+    and the second is the rounding of the argument \(\Omega(n+1)\) in the
+    direct path itself. For D=4, N=10^5 and the default anchor of 1024 the
+    measured relative difference of \(\gamma_n\) is below \(4\times10^{-12}\).
+
+    With ``compact=True`` the arrays are stored in the compact dtypes of
+    ``COMPACT_DTYPES`` (int32 indices, float32 coordinates, complex64
+    \(\gamma\)) at half the memory; see ``to_compact`` for the precision.
+    Values are still evaluated in float64, chunk by chunk, and rounded once,
+    and alpha and beta are returned as the same arrays as u and v.
     """
-    r_phi = 0.5 + np.sqrt(D+1)/2
+    if compact:
+        return _compact_carrier(N, D, method, anchor_every)
+    n_array = np.arange(N)
+    phase = _carrier_phase(n_array, D, method, anchor_every)
+    u, v, w, gamma, alpha, beta = _carrier_terms(n_array, D, phase)
+    return n_array, u, v, w, gamma, alpha, beta
+
+def _carrier_omega(D):
+    T_o = 4 * np.pi * (1 + np.sqrt(D+1))
+    return 2 * np.pi / T_o
+
+def _carrier_phase(n_array, D, method='direct', anchor_every=1024, prev=None):
+    # exp(-i*Omega*(n+1)) for a contiguous run of indices. In recurrence mode
+    # anchors sit at absolute indices n % anchor_every == 0, and ``prev`` (the
+    # phase at n_array[0]-1) lets a stream continue the recurrence across
+    # chunks so that it matches the batch result bit for bit.
+    Omega = _carrier_omega(D)
+    if method == 'direct':
+        return np.exp(-1j * Omega*(n_array+1))
+    if method != 'recurrence':
+        raise ValueError(f"Unknown carrier method: {method!r}")
+    step = np.exp(-1j * Omega)
+    phase = np.empty(len(n_array), dtype=complex)
+    if len(n_array) == 0:
+        return phase
+    starts = np.flatnonzero(n_array % anchor_every == 0)
+    if len(starts) == 0 or starts[0] != 0:
+        starts = np.concatenate(([0], starts))
+    for a, b in zip(starts, np.append(starts[1:], len(n_array))):
+        # One spare trailing element: np.cumprod rounds length-2 inputs
+        # differently from longer ones, and the spare keeps every run on the
+        # same code path whatever the chunking.
+        if n_array[a] % anchor_every == 0 or prev is None:
+            seg = np.full(b - a + 1, step)
+            seg[0] = np.exp(-1j * Omega*(n_array[a]+1))
+            phase[a:b] = np.cumprod(seg)[:-1]
+        else:
+            seg = np.full(b - a + 2, step)
+            seg[0] = prev
+            phase[a:b] = np.cumprod(seg)[1:-1]
+    return phase
+
+def _carrier_terms(n_array, D, phase):
+    # The time phase phi_n and time norm eta_n do not enter the carrier, so
+    # only the sync factor tau_n is evaluated.
     r_o = 1.0 / D
     r_eta = 0.5 + 1j * np.sqrt(D-1)/2  # equals e^(iπ/3)
     t_o = D + 3 + 3 + 3
-    T_o = 4 * np.pi * (1 + np.sqrt(D+1))
-    Omega = 2 * np.pi / T_o
-    n_array = np.arange(N)
-    phi = ((n_array+1)/r_o) * np.exp(1j * Omega*(n_array+1))
-    eta = (n_array+1) * r_eta
-    tau = r_o * r_eta * np.exp(-1j * Omega*(n_array+1))
-    alpha = (r_o+t_o - ((n_array+1)/(2*r_o))) * np.real(tau)
-    beta  = (r_o+t_o - ((np.sqrt(D-1)*(n_array+1))/2)) * np.imag(tau)
+    # tau = r_o * r_eta * phase, expanded into real arithmetic: NumPy's
+    # vectorized complex multiply can round differently depending on the
+    # array length, which would make chunked and batch carriers disagree.
+    c = r_o * r_eta
+    tau_re = c.real*phase.real - c.imag*phase.imag
+    tau_im = c.real*phase.imag + c.imag*phase.real
+    alpha = (r_o+t_o - ((n_array+1)/(2*r_o))) * tau_re
+    beta  = (r_o+t_o - ((np.sqrt(D-1)*(n_array+1))/2)) * tau_im
     gamma = alpha + 1j*beta
     u = np.real(gamma)
     v = np.imag(gamma)
     w = np.log2(np.abs(gamma) + 1e-9)
-    return n_array, u, v, w, gamma, alpha, beta
+    return u, v, w, gamma, alpha, beta
+
+def iter_carrier(stop, D=4, start=0, chunk_size=2**20, method='direct', anchor_every=1024, compact=False):
+    """
+    Stream the carrier in fixed-size chunks with bounded memory.
+
+    Each chunk is bit-identical to the matching slice of
+    ``compute_carrier(stop, D)``, so very long carriers can be fed straight
+    into renderers or file writers without ever being held in memory.
+
+    Parameters
+    ----------
+    stop : int
+        One past the last time index to generate.
+    D : int
+        Dimension of the toy universe.
+    start : int
+        First time index to generate.
+    chunk_size : int
+        Number of points per chunk (the last chunk may be shorter).
+    method : str
+        'direct' or 'recurrence' phase evaluation (see ``compute_carrier``).
+        The recurrence is carried across chunks, so any chunk size, including
+        1 for frame-by-frame pipelines, gives the batch values.
+    anchor_every : int
+        Re-anchoring period of the recurrence.
+    compact : bool
+        Yield the chunks in the ``COMPACT_DTYPES`` (see ``to_compact``).
+
+    Yields
+    ------
+    n, u, v, w, gamma : ndarray
+        Time indices and carrier values for ``n`` in ``[lo, hi)``.
+    """
+    prev = None
+    if method == 'recurrence' and start % anchor_every:
+        # Continue from the recurrence run since the previous anchor, as the
+        # batch evaluation does, instead of re-anchoring at ``start``.
+        prev = _carrier_phase(np.arange(start - start % anchor_every, start), D, method, anchor_every)[-1]
+    for lo in range(start, stop, chunk_size):
+        n = np.arange(lo, min(lo + chunk_size, stop))
+        phase = _carrier_phase(n, D, method, anchor_every, prev)
+        prev = phase[-1]
+        u, v, w, gamma, alpha, beta = _carrier_terms(n, D, phase)
+        if compact:
+            yield to_compact(n, u, v, w, gamma)
+        else:
+            yield n, u, v, w, gamma
+
+# =============================================================================
+# Compact Precision Mode (float32 / complex64 / uint8)
+# =============================================================================
+# Rendering never needs more than float32, so carriers can be kept at half of
+# their float64 size (and atlas point records, see
+# ``compass_functions.compact_atlas``, with a quarter-size uint8 color).
+# Values are always computed in float64 and rounded once to the compact type:
+# the phase argument Omega*(n+1) would lose whole radians in float32 for large
+# n. Rounding to float32 changes each coordinate by at most 2^-24 (6e-8) of
+# its magnitude, i.e. below 2e-8 of the plotted range (1.6e-4 pixels across
+# a 10^4-pixel-wide image, measured for N up to 10^6). uint8 colors differ
+# from the colormap by at most 1/510 per channel, the same quantization the
+# Agg renderer applies when it draws them.
+
+COMPACT_DTYPES = {'n_array': np.int32, 'u': np.float32, 'v': np.float32,
+                  'w': np.float32, 'gamma': np.complex64}
+
+def to_compact(n_array, u, v, w, gamma):
+    """
+    Round a float64 carrier to the ``COMPACT_DTYPES``.
+
+    Returns
+    -------
+    n_array, u, v, w, gamma : ndarray
+        int32 (int64 beyond 2^31 points), float32 and complex64 arrays.
+    """
+    n_dtype = np.int32 if len(n_array) == 0 or n_array[-1] < 2**31 else np.int64
+    return (np.asarray(n_array, dtype=n_dtype), *(np.asarray(x, dtype=COMPACT_DTYPES[name])
+            for name, x in zip(('u', 'v', 'w', 'gamma'), (u, v, w, gamma))))
+
+def _compact_carrier(N, D, method, anchor_every, chunk_size=2**20):
+    # Compact compute_carrier: float64 chunks are rounded into preallocated
+    # compact arrays, so the float64 carrier is never held in full.
+    arrays = [np.empty(N, dtype=np.int32 if N <= 2**31 else np.int64)]
+    arrays += [np.empty(N, dtype=COMPACT_DTYPES[name]) for name in ('u', 'v', 'w', 'gamma')]
+    for chunk in iter_carrier(N, D, chunk_size=chunk_size, method=method, anchor_every=anchor_every):
+        lo, hi = chunk[0][0], chunk[0][-1] + 1
+        for arr, values in zip(arrays, chunk):
+            arr[lo:hi] = values
+    n_array, u, v, w, gamma = arrays
+    return n_array, u, v, w, gamma, u, v
+
+# =============================================================================
+# Carrier Cache (reuse and extend carriers across scenes)
+# =============================================================================
+_CARRIER_FIELDS = ('n_array', 'u', 'v', 'w', 'gamma', 'alpha', 'beta', 'phase')
+
+class CarrierCache:
+    """
+    LRU cache of carriers keyed by (D, method, anchor_every).
+
+    A request for N points is served from any cached carrier of the same key:
+    a shorter N returns read-only views of the cached arrays, and a longer N
+    only computes the missing indices and appends them. Because chunked
+    evaluation is bit-identical to the batch one, cached results equal
+    ``compute_carrier(N, D, method, anchor_every)`` exactly.
+
+    Parameters
+    ----------
+    max_bytes : int
+        Memory cap; least recently used carriers are evicted beyond it. A
+        single carrier larger than the cap is computed but not kept.
+    """
+
+    def __init__(self, max_bytes=2**30):
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+
+    @property
+    def nbytes(self):
+        return sum(_entry_nbytes(e) for e in self._entries.values())
+
+    def clear(self):
+        self._entries.clear()
+
+    def get(self, N, D=4, method='direct', anchor_every=1024):
+        key = (D, method, anchor_every)
+        entry = self._entries.get(key)
+        if entry is None or len(entry['n_array']) < N:
+            entry = self._extend(entry, N, D, method, anchor_every)
+            if _entry_nbytes(entry) <= self.max_bytes:
+                self._entries[key] = entry
+                self._entries.move_to_end(key)
+                self._evict()
+        else:
+            self._entries.move_to_end(key)
+        return tuple(entry[f][:N] for f in _CARRIER_FIELDS[:-1])
+
+    def _extend(self, entry, N, D, method, anchor_every):
+        start = 0 if entry is None else len(entry['n_array'])
+        n = np.arange(start, N)
+        prev = None if entry is None or not len(entry['phase']) else entry['phase'][-1]
+        phase = _carrier_phase(n, D, method, anchor_every, prev)
+        new = dict(zip(_CARRIER_FIELDS, (n, *_carrier_terms(n, D, phase), phase)))
+        if entry is not None:
+            new = {f: np.concatenate((entry[f], new[f])) for f in _CARRIER_FIELDS}
+        for arr in new.values():
+            arr.flags.writeable = False
+        return new
+
+    def _evict(self):
+        while self.nbytes > self.max_bytes:
+            self._entries.popitem(last=False)
+
+def _entry_nbytes(entry):
+    return sum(arr.nbytes for arr in entry.values())
+
+carrier_cache = CarrierCache()
+
+def cached_carrier(N, D=4, method='direct', anchor_every=1024):
+    """``compute_carrier`` served from the module-level ``carrier_cache``."""
+    return carrier_cache.get(N, D, method, anchor_every)
 
 # =============================================================================
 # Helper Functions for Coloring and Plotting
 # =============================================================================
 def get_colors(n_array, M_c, cmap_name='hsv'):
-    indices = n_array % M_c
-    cmap = plt.get_cmap(cmap_name, M_c)
-    return [cmap(i) for i in indices]
+    """RGBA colors (N, 4) of the indices n mod M_c, looked up in one indexing step."""
+    return colormap_lut(cmap_name, M_c)[np.asarray(n_array) % M_c]
 
 def remove_axes(ax):
     ax.set_xticks([])
@@ -197,12 +424,231 @@ transforms = [
     {"wormhole": 2, "flower": 5, "group": "y(-z)x", "func": lambda u,v,w: ( -v, -w, -u)},
 ]
 
+# =============================================================================
+# Matrix-backed Transform Engine (all 48 symmetries in one batched operation)
+# =============================================================================
+def transform_tensor(transform_list):
+    """
+    Convert a list of transform dicts into signed-permutation matrices.
+
+    Each ``func`` is evaluated on the basis vectors of (u, v, w), so row j of
+    matrix k holds the coefficients of output coordinate j of transform k.
+
+    Parameters
+    ----------
+    transform_list : list of dict
+        Transforms with "wormhole", "flower", "group" and "func" keys
+        (e.g. ``transforms`` or a filtered subset of it).
+
+    Returns
+    -------
+    matrices : ndarray, shape (K, 3, 3), int8
+    wormholes, flowers : ndarray, shape (K,), int
+    groups : ndarray, shape (K,), str
+    """
+    basis = np.eye(3)
+    matrices = np.array([np.array(t["func"](*basis)) for t in transform_list], dtype=np.int8)
+    wormholes = np.array([t["wormhole"] for t in transform_list], dtype=int)
+    flowers = np.array([t["flower"] for t in transform_list], dtype=int)
+    groups = np.array([t["group"] for t in transform_list])
+    return matrices, wormholes, flowers, groups
+
+TRANSFORM_MATRICES, TRANSFORM_WORMHOLES, TRANSFORM_FLOWERS, TRANSFORM_GROUPS = transform_tensor(transforms)
+
+def stack_carrier(u, v, w, dtype=None):
+    """Stack the carrier coordinates into a single (N, 3) array."""
+    return np.stack((u, v, w), axis=-1) if dtype is None else np.stack((u, v, w), axis=-1).astype(dtype, copy=False)
+
+def select_transforms(flower_index=None, wormhole_index=None):
+    """Indices into TRANSFORM_MATRICES for a given flower and/or wormhole."""
+    mask = np.ones(len(TRANSFORM_MATRICES), dtype=bool)
+    if flower_index is not None:
+        mask &= TRANSFORM_FLOWERS == flower_index
+    if wormhole_index is not None:
+        mask &= TRANSFORM_WORMHOLES == wormhole_index
+    return np.flatnonzero(mask)
+
+def apply_transforms(carrier, matrices=None, out=None):
+    """
+    Apply all signed-permutation transforms to an (N, 3) carrier at once.
+
+    Parameters
+    ----------
+    carrier : ndarray, shape (N, 3)
+        Stacked (u, v, w) carrier, see ``stack_carrier``.
+    matrices : ndarray, shape (K, 3, 3), optional
+        Transform matrices (default: all 48 ``TRANSFORM_MATRICES``).
+    out : ndarray, shape (K, N, 3), optional
+        Preallocated output buffer, reused across frames to avoid allocation.
+
+    Returns
+    -------
+    curves : ndarray, shape (K, N, 3)
+        ``curves[k, :, 0]``, ``curves[k, :, 1]``, ``curves[k, :, 2]`` are the
+        x, y, z coordinates of transform k.
+    """
+    if matrices is None:
+        matrices = TRANSFORM_MATRICES
+    carrier = np.asarray(carrier)
+    # Signed permutations are exact in floating point: each output entry is
+    # one input entry times +-1 plus zeros.
+    rot = np.swapaxes(matrices, 1, 2).astype(carrier.dtype, copy=False)
+    if out is None:
+        out = np.empty((len(matrices), carrier.shape[0], 3), dtype=carrier.dtype)
+    return np.matmul(carrier, rot, out=out)
+
+def build_segments(curves):
+    """
+    Build line segments joining consecutive points of one or many curves.
+
+    Parameters
+    ----------
+    curves : ndarray, shape (N, 3) or (K, N, 3)
+        A single curve or a stack of curves (e.g. from ``apply_transforms``).
+
+    Returns
+    -------
+    segments : ndarray, shape (N-1, 2, 3) or (K*(N-1), 2, 3)
+        Segment i of curve k is ``[curves[k, i], curves[k, i+1]]``; curves are
+        concatenated in order so one ``Line3DCollection`` can draw them all.
+    """
+    curves = np.asarray(curves)
+    segments = np.stack((curves[..., :-1, :], curves[..., 1:, :]), axis=-2)
+    return segments.reshape(-1, 2, curves.shape[-1])
+
+def frame_limits(curves, margin=0.1):
+    """
+    Axis limits for every animation frame from prefix extrema of the curves.
+
+    Parameters
+    ----------
+    curves : ndarray, shape (K, N, 3)
+        Stack of curves (e.g. from ``apply_transforms``).
+    margin : float
+        Fraction of the current extent added on each side. When a coordinate
+        has zero extent a margin of 1 is used instead.
+
+    Returns
+    -------
+    limits : ndarray, shape (N, 3, 2)
+        ``limits[i, j]`` is the (low, high) limit of coordinate j once points
+        ``0..i`` of all curves are visible.
+    """
+    curves = np.asarray(curves)
+    lo = np.minimum.accumulate(curves.min(axis=0), axis=0)
+    hi = np.maximum.accumulate(curves.max(axis=0), axis=0)
+    extent = hi - lo
+    pad = np.where(hi > lo, margin * extent, 1)
+    return np.stack((lo - pad, hi + pad), axis=-1)
+
+# =============================================================================
+# Symmetry-instanced Atoms (one carrier + 48 transform descriptors)
+# =============================================================================
+def transform_intervals(lo, hi, matrices=None):
+    """
+    Per-axis ranges of transformed points from the ranges of the carrier.
+
+    For a matrix M, output coordinate j ranges over
+    ``[M+ lo - M- hi, M+ hi - M- lo]`` with M+ = max(M, 0) and M- = max(-M, 0).
+    This is exact for signed permutations, so bounds of all curves follow
+    from the carrier's own per-axis min/max.
+
+    Parameters
+    ----------
+    lo, hi : ndarray, shape (..., 3)
+        Lower and upper bounds of (u, v, w).
+    matrices : ndarray, shape (K, 3, 3), optional
+        Transform matrices (default: all 48 ``TRANSFORM_MATRICES``).
+
+    Returns
+    -------
+    lo, hi : ndarray, shape (K, ..., 3)
+    """
+    if matrices is None:
+        matrices = TRANSFORM_MATRICES
+    pos = np.swapaxes(np.maximum(matrices, 0), 1, 2).astype(np.float64)
+    neg = np.swapaxes(np.maximum(-matrices, 0), 1, 2).astype(np.float64)
+    lo = np.asarray(lo, dtype=np.float64)
+    hi = np.asarray(hi, dtype=np.float64)
+    return np.matmul(lo, pos) - np.matmul(hi, neg), np.matmul(hi, pos) - np.matmul(lo, neg)
+
+class InstancedAtom:
+    """
+    An atom stored as its fundamental (N, 3) carrier plus K transform matrices.
+
+    The K transformed curves are only expanded when asked for (``curves``,
+    ``curve``) or straight into projected coordinates (``project``), which
+    folds the transform into the projection matrix. Bounds come analytically
+    from the carrier's per-axis extrema (``transform_intervals``), so the
+    resident memory of an atom is that of a single curve.
+
+    Parameters
+    ----------
+    carrier : ndarray, shape (N, 3)
+        Stacked (u, v, w) carrier, see ``stack_carrier``.
+    matrices : ndarray, shape (K, 3, 3), optional
+        Transform matrices (default: all 48 ``TRANSFORM_MATRICES``).
+    """
+
+    def __init__(self, carrier, matrices=None):
+        self.carrier = np.asarray(carrier)
+        self.matrices = TRANSFORM_MATRICES if matrices is None else np.asarray(matrices)
+
+    def __len__(self):
+        return len(self.matrices)
+
+    @property
+    def shape(self):
+        return (len(self.matrices),) + self.carrier.shape
+
+    def curve(self, k):
+        """Transformed curve k, shape (N, 3)."""
+        return apply_transforms(self.carrier, self.matrices[k:k + 1])[0]
+
+    def curves(self, out=None):
+        """All transformed curves, shape (K, N, 3), see ``apply_transforms``."""
+        return apply_transforms(self.carrier, self.matrices, out)
+
+    def project(self, projection, out=None):
+        """
+        Transformed and projected curves ``curves() @ projection`` computed
+        directly from the carrier, shape (K, N, P).
+
+        Parameters
+        ----------
+        projection : ndarray, shape (3, P)
+            Linear map applied to every transformed point.
+        out : ndarray, shape (K, N, P), optional
+            Output buffer.
+        """
+        composite = np.matmul(np.swapaxes(self.matrices, 1, 2).astype(np.float64), projection)
+        return np.matmul(self.carrier, composite.astype(self.carrier.dtype, copy=False), out=out)
+
+    def bounds(self):
+        """(low, high) of each axis over all curves, shape (3, 2)."""
+        lo, hi = transform_intervals(self.carrier.min(axis=0), self.carrier.max(axis=0), self.matrices)
+        return np.stack((lo.min(axis=0), hi.max(axis=0)), axis=-1)
+
+    def radius(self):
+        """Largest distance of any point from the origin (the same for every curve)."""
+        return np.sqrt((self.carrier.astype(np.float64) ** 2).sum(axis=1).max())
+
+    def frame_limits(self, margin=0.1):
+        """Same as ``frame_limits(self.curves(), margin)`` without expanding the curves."""
+        lo, hi = transform_intervals(np.minimum.accumulate(self.carrier, axis=0),
+                                     np.maximum.accumulate(self.carrier, axis=0), self.matrices)
+        lo = lo.min(axis=0)
+        hi = hi.max(axis=0)
+        extent = hi - lo
+        pad = np.where(hi > lo, margin * extent, 1)
+        return np.stack((lo - pad, hi + pad), axis=-1)
+
 # =============================================================================
 # Static Atom Plot Function (Scatter-focused)
 # =============================================================================
 def plot_atom(n_array, u, v, w, gamma, M_c, plot_mode='both',
               scatter_size=20, scatter_alpha=1.0,
-              line_alpha=0.7, line_width=1.5, line_cmap='viridis'):
+              line_alpha=0.7, line_width=1.5, line_cmap='viridis', curves=None):
     """
     Create a static 3D atom plot (48 curves) using the rotated carrier.
     
@@ -228,6 +674,9 @@ def plot_atom(n_array, u, v, w, gamma, M_c, plot_mode='both',
         Width of line segments.
     line_cmap : str
         Colormap name for line segments (gradient from |Δγ|).
+    curves : ndarray, shape (48, N, 3), or InstancedAtom, optional
+        Precomputed transformed curves (e.g. a memmap from ``atlas_store``),
+        used as-is instead of transforming (u, v, w) again.
     """
     N = len(n_array)
     dZ = np.abs(np.diff(gamma))
@@ -239,14 +688,19 @@ def plot_atom(n_array, u, v, w, gamma, M_c, plot_mode='both',
     ax = fig.add_subplot(111, projection='3d', facecolor='black')
     fig.patch.set_facecolor('black')
     
-    # Loop through each transform and plot its rotated curve.
-    for t in transforms:
-        x, y, z = t["func"](u, v, w)
-        if plot_mode in ['line', 'both']:
-            segments = np.array([[[x[i], y[i], z[i]], [x[i+1], y[i+1], z[i+1]]] for i in range(N-1)])
-            seg_colors = [line_cm(norm_dZ[i]) for i in range(N-1)]
-            lc = Line3DCollection(segments, colors=seg_colors, linewidths=line_width, alpha=line_alpha)
-            ax.add_collection3d(lc)
+    # Rotate the carrier by all 48 transforms in one batched operation.
+    if curves is None:
+        curves = apply_transforms(stack_carrier(u, v, w))
+    elif isinstance(curves, InstancedAtom):
+        curves = curves.curves()
+    if plot_mode in ['line', 'both']:
+        # One merged collection for all 48 curves, colored by a single colormap call.
+        segments = build_segments(curves)
+        seg_colors = np.tile(line_cm(norm_dZ), (len(curves), 1))
+        lc = Line3DCollection(segments, colors=seg_colors, linewidths=line_width, alpha=line_alpha)
+        ax.add_collection3d(lc)
+    for curve in curves:
+        x, y, z = curve[:, 0], curve[:, 1], curve[:, 2]
         if plot_mode in ['scatter', 'both']:
             ax.scatter(x, y, z, s=scatter_size, c=scatter_colors, alpha=scatter_alpha, depthshade=True)
     
@@ -258,10 +712,124 @@ def plot_atom(n_array, u, v, w, gamma, M_c, plot_mode='both',
 # =============================================================================
 # Animated Atom Plot Function (Scatter-focused, with dynamic zoom-out)
 # =============================================================================
+def _instanced_view(carrier, matrices, index):
+    # Points ``index`` of every transformed curve, shape (K, n, 3).
+    return apply_transforms(carrier[index], matrices)
+
+def _stacked_view(curves, index):
+    return curves[:, index]
+
+def atom_scene(n_array, u, v, w, gamma, M_c, plot_mode='both',
+               scatter_size=20, scatter_alpha=1.0,
+               line_alpha=0.7, line_width=1.5, line_cmap='viridis', curves=None,
+               lod=False, lod_resolution=None):
+    """
+    Build the animated atom figure and its frame update function.
+
+    Takes the same arguments as ``animate_atom`` and returns ``(fig, update)``.
+    ``update(frame)`` shows the points ``0..frame-1`` of every curve and only
+    depends on ``frame``.
+    """
+    dZ = np.abs(np.diff(gamma))
+    norm_dZ = (dZ - dZ.min()) / (dZ.max() - dZ.min()) if dZ.max()-dZ.min()>0 else np.zeros_like(dZ)
+    line_cm = plt.get_cmap(line_cmap)
+    # One shared RGBA array; frames only take slices of it.
+    scatter_colors = get_colors(n_array, M_c, cmap_name='hsv')
+    line_colors = line_cm(norm_dZ)
+    
+    # Per-frame axis limits; they follow analytically from the carrier when
+    # it is known. An instanced atom is then only expanded for the points a
+    # frame draws (the transforms are exact, so these equal slices of
+    # ``curves.curves()``); precomputed curves are sliced as they are.
+    if curves is None:
+        curves = InstancedAtom(stack_carrier(u, v, w))
+    if isinstance(curves, InstancedAtom):
+        limits = curves.frame_limits()
+        fundamental = curves.carrier
+        view = partial(_instanced_view, fundamental, curves.matrices)
+    else:
+        limits = frame_limits(curves)
+        fundamental = curves[0]
+        view = partial(_stacked_view, curves)
+    draw_points = plot_mode in ['scatter', 'both']
+    draw_lines = plot_mode in ['line', 'both']
+    
+    fig = plt.figure(figsize=(16, 16), facecolor='black')
+    ax = fig.add_subplot(111, projection='3d', facecolor='black')
+    fig.patch.set_facecolor('black')
+    remove_axes(ax)
+    
+    # Create empty lists to hold the scatter and line objects.
+    scatter_objs = []
+    line_objs = []
+    
+    for curve in view(slice(0, 1)):
+        if draw_points:
+            sc = ax.scatter(curve[:, 0], curve[:, 1], curve[:, 2],
+                            s=scatter_size, c=scatter_colors[:1], alpha=scatter_alpha, depthshade=True)
+            scatter_objs.append(sc)
+        else:
+            scatter_objs.append(None)
+        if draw_lines:
+            ln, = ax.plot(curve[:, 0], curve[:, 1], curve[:, 2],
+                          color=line_cm(0), lw=line_width, alpha=line_alpha)
+            line_objs.append(ln)
+        else:
+            line_objs.append(None)
+    
+    ax.set_title("Animated Atom Plot", color='white', pad=20)
+    initial_limits = (ax.get_xlim(), ax.get_ylim(), ax.get_zlim())
+
+    # Level-of-detail pyramid of the fundamental curve. The transforms map
+    # grid cells to grid cells, so its decimation holds for all 48 curves.
+    pyramid = None
+    if lod:
+        resolution = lod_resolution or fig.get_figwidth() * fig.dpi
+        cells = pixel_cells(limits, resolution)
+        pyramid = DetailPyramid(fundamental, cells)
+    
+    def update(frame):
+        # Every frame is a slice (view) of the precomputed arrays, so the cost
+        # of an update does not depend on how many frames came before it.
+        # It also only depends on ``frame``, so frames can be rendered in any
+        # order (e.g. split across processes by ``video_export``). With
+        # ``lod`` the points are those of the pyramid level of the frame.
+        points = path = slice(0, frame)
+        if pyramid is not None and frame > 0:
+            points = pyramid.indices(frame, cells[frame - 1])
+            path = pyramid.indices(frame, cells[frame - 1], lines=True)
+        cur_colors = scatter_colors[points]
+        line_color = line_cm(0)
+        if frame > 1 and len(line_colors):
+            line_color = line_colors[min(frame - 2, len(line_colors) - 1)]
+        point_curves = view(points) if draw_points else None
+        path_curves = None
+        if draw_lines:
+            path_curves = point_curves if draw_points and path is points else view(path)
+        for i in range(len(scatter_objs)):
+            if scatter_objs[i] is not None:
+                curve = point_curves[i]
+                scatter_objs[i]._offsets3d = (curve[:, 0], curve[:, 1], curve[:, 2])
+                scatter_objs[i].set_facecolors(cur_colors)
+            if line_objs[i] is not None:
+                curve = path_curves[i]
+                line_objs[i].set_data(curve[:, 0], curve[:, 1])
+                line_objs[i].set_3d_properties(curve[:, 2])
+                line_objs[i].set_color(line_color)
+        # Axis limits for the current points, with a 10% margin.
+        (x_lo, x_hi), (y_lo, y_hi), (z_lo, z_hi) = limits[frame - 1] if frame > 0 else initial_limits
+        ax.set_xlim(x_lo, x_hi)
+        ax.set_ylim(y_lo, y_hi)
+        ax.set_zlim(z_lo, z_hi)
+        return scatter_objs + line_objs
+
+    return fig, update
+
 def animate_atom(n_array, u, v, w, gamma, M_c, plot_mode='both',
                  scatter_size=20, scatter_alpha=1.0,
                  line_alpha=0.7, line_width=1.5, line_cmap='viridis',
-                 frame_interval=1000, video_file=None):
+                 frame_interval=1000, video_file=None, curves=None, workers=None,
+                 backend='writer', codec=None, crf=None, lod=False, lod_resolution=None):
     """
     Animate the atom plot over time with dynamic zoom-out.
     
@@ -294,86 +862,40 @@ def animate_atom(n_array, u, v, w, gamma, M_c, plot_mode='both',
         Time (in ms) between frames (default 1000 ms/frame).
     video_file : str or None
         If provided, the animation is saved to this file.
+    curves : ndarray, shape (48, N, 3), or InstancedAtom, optional
+        Precomputed transformed curves (e.g. a memmap from ``atlas_store``),
+        used as-is instead of transforming (u, v, w) again.
+    workers : int or None
+        If given together with ``video_file``, frames are rendered on this
+        many processes with ``video_export.export_video`` (0 uses every
+        core). The video is identical to the serial export.
+    backend : str
+        Video export backend: 'writer' (matplotlib's FFMpegWriter) or 'pipe'
+        (Agg canvas buffers written straight into ffmpeg, see
+        ``video_export``; reports its frame throughput).
+    codec, crf : optional
+        Encoder codec and constant rate factor for the 'pipe' backend.
+    lod : bool
+        Draw each frame from a level-of-detail pyramid (``level_of_detail``):
+        points sharing a half-pixel cell are drawn once and line runs
+        inside such a cell are shortened, so late, zoomed-out
+        frames cost about as much as the pixels they cover instead of their
+        point count.
+    lod_resolution : float, optional
+        Output width in pixels used to pick the levels (default: the figure
+        width times its dpi).
     """
     N = len(n_array)
-    dZ = np.abs(np.diff(gamma))
-    norm_dZ = (dZ - dZ.min()) / (dZ.max() - dZ.min()) if dZ.max()-dZ.min()>0 else np.zeros_like(dZ)
-    line_cm = plt.get_cmap(line_cmap)
-    scatter_colors = get_colors(n_array, M_c, cmap_name='hsv')
-    
-    # Precompute rotated curves for all transforms.
-    curves = []
-    for t in transforms:
-        x, y, z = t["func"](u, v, w)
-        curves.append({'x': x, 'y': y, 'z': z})
-    
-    fig = plt.figure(figsize=(16, 16), facecolor='black')
-    ax = fig.add_subplot(111, projection='3d', facecolor='black')
-    fig.patch.set_facecolor('black')
-    remove_axes(ax)
-    
-    # Create empty lists to hold the scatter and line objects.
-    scatter_objs = []
-    line_objs = []
-    
-    for curve in curves:
-        if plot_mode in ['scatter', 'both']:
-            sc = ax.scatter(curve['x'][:1], curve['y'][:1], curve['z'][:1],
-                            s=scatter_size, c=np.array(scatter_colors[:1]), alpha=scatter_alpha, depthshade=True)
-            scatter_objs.append(sc)
-        else:
-            scatter_objs.append(None)
-        if plot_mode in ['line', 'both']:
-            ln, = ax.plot(curve['x'][:1], curve['y'][:1], curve['z'][:1],
-                          color=line_cm(0), lw=line_width, alpha=line_alpha)
-            line_objs.append(ln)
-        else:
-            line_objs.append(None)
-    
-    ax.set_title("Animated Atom Plot", color='white', pad=20)
-    
-    def update(frame):
-        # Lists to collect current points across all curves.
-        all_x = []
-        all_y = []
-        all_z = []
-        for i, curve in enumerate(curves):
-            cur_x = curve['x'][:frame]
-            cur_y = curve['y'][:frame]
-            cur_z = curve['z'][:frame]
-            all_x.extend(cur_x)
-            all_y.extend(cur_y)
-            all_z.extend(cur_z)
-            if scatter_objs[i] is not None:
-                scatter_objs[i]._offsets3d = (cur_x, cur_y, cur_z)
-                new_colors = np.array(scatter_colors[:frame])
-                scatter_objs[i].set_facecolors(new_colors)
-            if line_objs[i] is not None:
-                line_objs[i].set_data(cur_x, cur_y)
-                line_objs[i].set_3d_properties(cur_z)
-                if frame > 1:
-                    idx = frame - 2 if frame - 2 < len(norm_dZ) else -1
-                    line_objs[i].set_color(line_cm(norm_dZ[idx]))
-        # Update axis limits dynamically based on current points, with a 10% margin.
-        if all_x and all_y and all_z:
-            min_x, max_x = np.min(all_x), np.max(all_x)
-            min_y, max_y = np.min(all_y), np.max(all_y)
-            min_z, max_z = np.min(all_z), np.max(all_z)
-            margin_x = 0.1 * (max_x - min_x) if max_x > min_x else 1
-            margin_y = 0.1 * (max_y - min_y) if max_y > min_y else 1
-            margin_z = 0.1 * (max_z - min_z) if max_z > min_z else 1
-            ax.set_xlim(min_x - margin_x, max_x + margin_x)
-            ax.set_ylim(min_y - margin_y, max_y + margin_y)
-            ax.set_zlim(min_z - margin_z, max_z + margin_z)
-        return scatter_objs + line_objs
+    build_scene = partial(atom_scene, n_array, u, v, w, gamma, M_c, plot_mode,
+                          scatter_size, scatter_alpha, line_alpha, line_width,
+                          line_cmap, curves, lod, lod_resolution)
+    if video_file:
+        save_scene(build_scene, N, video_file, 1, workers, backend, codec, crf)
+        return
 
+    fig, update = build_scene()
     ani = FuncAnimation(fig, update, frames=N, interval=frame_interval, blit=False)
-    
-    if video_file:
-        writer = FFMpegWriter(fps=1)
-        ani.save(video_file, writer=writer)
-    else:
-        plt.show()
+    plt.show()
 
 # =============================================================================
 # Main Execution
@@ -384,8 +906,8 @@ def main():
     D = 4           # For our toy-universe: 3+1=4
     M_c = 13        # Color modulus (n mod M_c)
     
-    # Compute the carrier using our formulas.
-    n_array, u, v, w, gamma, alpha, beta = compute_carrier(N, D)
+    # Compute the carrier using our formulas (cached across scenes).
+    n_array, u, v, w, gamma, alpha, beta = cached_carrier(N, D)
     
     # # To plot the Atom structure (all 48 curves) statically as scatter only:
     # plot_atom(n_array, u, v, w, gamma, M_c, plot_mode='scatter',
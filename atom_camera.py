@@ -0,0 +1,271 @@
+from functools import partial
+
+import numpy as np
+import matplotlib.pyplot as plt
+from matplotlib.animation import FuncAnimation
+from matplotlib.collections import LineCollection
+
+from atom import get_colors, stack_carrier, build_segments, InstancedAtom
+from atlas_raster import accumulate, shade
+from video_export import save_scene
+
+# =============================================================================
+# Camera Projection (3D atom curves -> 2D screen, without mplot3d)
+# =============================================================================
+# The camera is placed like manim's ThreeDScene.set_camera_orientation: phi is
+# the polar angle of the camera measured from +z and theta its azimuth, both in
+# radians (phi=0, theta=-pi/2 looks down the z axis with x to the right and y
+# up). A view is a single (3, 3) rotation whose rows are the screen right, up
+# and out-of-screen directions, so projecting all 48 curves of a frame is one
+# matrix multiply; perspective only adds an elementwise division by depth.
+
+def camera_matrix(phi, theta):
+    """
+    Rotation from world to camera coordinates, shape (3, 3).
+
+    Rows are the screen right, screen up and out-of-screen (towards the
+    camera) unit vectors.
+    """
+    sin_p, cos_p = np.sin(phi), np.cos(phi)
+    sin_t, cos_t = np.sin(theta), np.cos(theta)
+    return np.array([[-sin_t, cos_t, 0.0],
+                     [-cos_p * cos_t, -cos_p * sin_t, sin_p],
+                     [sin_p * cos_t, sin_p * sin_t, cos_p]])
+
+def camera_projection(phi, theta):
+    """Orthographic projection matrix (3, 2), e.g. for ``atlas_raster.raster_carrier``."""
+    return camera_matrix(phi, theta)[:2].T
+
+def project(points, phi, theta, distance=None, center=None):
+    """
+    Project 3D points to screen coordinates.
+
+    Parameters
+    ----------
+    points : ndarray, shape (..., 3), or InstancedAtom
+        World coordinates, e.g. the (48, N, 3) transformed curves. An
+        ``atom.InstancedAtom`` is projected straight from its carrier.
+    phi, theta : float
+        Camera orientation in radians (see module notes).
+    distance : float, optional
+        Distance from the camera to ``center``. ``None`` gives an orthographic
+        projection; otherwise a perspective one in which points at ``center``
+        keep their orthographic size. Points at or behind the camera are NaN.
+    center : array_like, shape (3,), optional
+        Point the camera looks at (default: the origin).
+
+    Returns
+    -------
+    screen : ndarray, shape (..., 2)
+        Screen (x, y) coordinates.
+    depth : ndarray, shape (...)
+        Signed distance towards the camera; larger values are nearer.
+    """
+    rotation = camera_matrix(phi, theta)
+    if isinstance(points, InstancedAtom):
+        view = points.project(rotation.T)
+        if center is not None:
+            view -= np.asarray(center) @ rotation.T
+    else:
+        points = np.asarray(points)
+        if center is not None:
+            points = points - np.asarray(center)
+        view = points @ rotation.T
+    screen = view[..., :2]
+    depth = view[..., 2]
+    if distance is not None:
+        with np.errstate(divide='ignore', invalid='ignore'):
+            scale = np.where(depth < distance, distance / (distance - depth), np.nan)
+        screen = screen * scale[..., None]
+    return screen, depth
+
+def depth_order(depth):
+    """Indices sorting flattened ``depth`` from far to near (painter's order)."""
+    return np.argsort(np.ravel(depth), kind='stable')
+
+def orbit_angles(n_frames, phi=(75 * np.pi / 180, 60 * np.pi / 180), theta=(30 * np.pi / 180, 60 * np.pi / 180)):
+    """
+    Per-frame camera angles moving linearly between two orientations.
+
+    Defaults follow ``aton_animation.AtomAnimation`` (from phi=75°, theta=30°
+    to phi=60°, theta=60°), like manim's ``move_camera``.
+
+    Returns
+    -------
+    phis, thetas : ndarray, shape (n_frames,)
+    """
+    return np.linspace(*phi, n_frames), np.linspace(*theta, n_frames)
+
+def view_bounds(curves, distance=None, center=None, margin=0.1):
+    """
+    Square screen extent (xmin, xmax, ymin, ymax) containing the curves from
+    every camera orientation, so an orbit needs no per-frame zoom.
+
+    For an ``atom.InstancedAtom`` the radius is taken from the carrier alone;
+    an off-origin ``center`` then widens it by ``|center|``, which still
+    bounds every curve.
+    """
+    if isinstance(curves, InstancedAtom):
+        radius = curves.radius()
+        if center is not None:
+            radius += np.linalg.norm(center)
+    else:
+        points = np.asarray(curves).reshape(-1, 3)
+        if center is not None:
+            points = points - np.asarray(center)
+        radius = np.sqrt((points ** 2).sum(axis=1).max())
+    if distance is not None:
+        radius *= distance / max(distance - radius, 1e-9)
+    radius *= 1 + margin
+    return (-radius, radius, -radius, radius)
+
+# =============================================================================
+# 2D Scatter/Line Scene and Orbit Video
+# =============================================================================
+def camera_scene(n_array, u, v, w, gamma, M_c, phis, thetas, plot_mode='scatter',
+                 scatter_size=20, scatter_alpha=1.0,
+                 line_alpha=0.7, line_width=1.5, line_cmap='viridis', curves=None,
+                 distance=None, center=None, depth_sort=True):
+    """
+    Build a camera-orbit figure of the full atom and its frame update function.
+
+    The figure is a plain 2D axes holding one scatter and/or one line
+    collection for all curves. ``update(frame)`` projects every point with the
+    camera ``(phis[frame], thetas[frame])`` and, with ``depth_sort``, draws
+    points and segments from far to near. It only depends on ``frame``, so it
+    works with ``video_export``.
+
+    Parameters
+    ----------
+    n_array, u, v, w, gamma, M_c, plot_mode, scatter_size, scatter_alpha,
+    line_alpha, line_width, line_cmap, curves :
+        As in ``atom.animate_atom``.
+    phis, thetas : ndarray
+        Camera angles of each frame (see ``orbit_angles``).
+    distance, center :
+        Perspective distance and look-at point (see ``project``).
+    depth_sort : bool
+        Sort points and segments by depth on every frame.
+    """
+    if curves is None:
+        curves = InstancedAtom(stack_carrier(u, v, w))
+    dZ = np.abs(np.diff(gamma))
+    norm_dZ = (dZ - dZ.min()) / (dZ.max() - dZ.min()) if dZ.max() - dZ.min() > 0 else np.zeros_like(dZ)
+    # Colors of one curve. Points and segments are flattened curve by curve,
+    # so a flat index i takes color i % N (segments: i % (N-1)); collections
+    # also cycle a shorter color list that way when nothing is sorted.
+    scatter_colors = get_colors(n_array, M_c, cmap_name='hsv')
+    line_colors = plt.get_cmap(line_cmap)(norm_dZ)
+    xmin, xmax, ymin, ymax = view_bounds(curves, distance, center)
+
+    fig = plt.figure(figsize=(16, 16), facecolor='black')
+    ax = fig.add_subplot(111, facecolor='black')
+    ax.set_xlim(xmin, xmax)
+    ax.set_ylim(ymin, ymax)
+    ax.set_aspect('equal')
+    ax.set_axis_off()
+    ax.set_title("Atom Camera Orbit", color='white', pad=20)
+
+    scatter = lines = None
+    if plot_mode in ['line', 'both']:
+        lines = LineCollection([], linewidths=line_width, alpha=line_alpha)
+        ax.add_collection(lines, autolim=False)
+    if plot_mode in ['scatter', 'both']:
+        scatter = ax.scatter(np.zeros(0), np.zeros(0), s=scatter_size, alpha=scatter_alpha)
+
+    def update(frame):
+        # Project the (K, N) points once; segments are paired from them.
+        screen, depth = project(curves, phis[frame], thetas[frame], distance, center)
+        if scatter is not None:
+            points = screen.reshape(-1, 2)
+            colors = scatter_colors
+            if depth_sort:
+                order = depth_order(depth)
+                points = points[order]
+                colors = scatter_colors[order % len(scatter_colors)]
+            scatter.set_offsets(points)
+            scatter.set_facecolors(colors)
+        if lines is not None:
+            segments = build_segments(screen)
+            colors = line_colors
+            if depth_sort and len(line_colors):
+                order = depth_order(depth[:, :-1] + depth[:, 1:])
+                segments = segments[order]
+                colors = line_colors[order % len(line_colors)]
+            lines.set_segments(segments)
+            lines.set_color(colors)
+        return [a for a in (scatter, lines) if a is not None]
+
+    return fig, update
+
+def animate_atom_orbit(n_array, u, v, w, gamma, M_c, phis=None, thetas=None, n_frames=120,
+                       plot_mode='scatter', scatter_size=20, scatter_alpha=1.0,
+                       line_alpha=0.7, line_width=1.5, line_cmap='viridis',
+                       frame_interval=40, video_file=None, curves=None,
+                       distance=None, center=None, depth_sort=True,
+                       fps=25, workers=None, backend='writer', codec=None, crf=None):
+    """
+    Orbit the camera around the full atom (see ``camera_scene``).
+
+    Parameters
+    ----------
+    phis, thetas : ndarray, optional
+        Camera angles per frame (default: ``orbit_angles(n_frames)``).
+    n_frames : int
+        Number of frames when the angles are not given.
+    frame_interval : int
+        Time (in ms) between frames when shown interactively.
+    fps : float
+        Frames per second of the saved video.
+    workers, backend, codec, crf :
+        Video export options, as in ``atom.animate_atom``.
+
+    The remaining parameters are those of ``camera_scene``.
+    """
+    if phis is None or thetas is None:
+        phis, thetas = orbit_angles(n_frames)
+    n_frames = len(phis)
+    build_scene = partial(camera_scene, n_array, u, v, w, gamma, M_c, phis, thetas, plot_mode,
+                          scatter_size, scatter_alpha, line_alpha, line_width, line_cmap,
+                          curves, distance, center, depth_sort)
+    if video_file:
+        save_scene(build_scene, n_frames, video_file, fps, workers, backend, codec, crf)
+        return
+
+    fig, update = build_scene()
+    ani = FuncAnimation(fig, update, frames=n_frames, interval=frame_interval, blit=False)
+    plt.show()
+
+# =============================================================================
+# Raster Output
+# =============================================================================
+def raster_view(curves, n_array, M_c, phi, theta, distance=None, center=None,
+                shape=(1024, 1024), extent=None, how='add', log=True, cmap_name='hsv'):
+    """
+    Rasterize the curves seen from one camera with ``atlas_raster``.
+
+    Points are colored by n mod M_c like ``atom.get_colors``. The default
+    extent is ``view_bounds``, fixed across camera angles. An
+    ``atom.InstancedAtom`` is projected and accumulated one curve at a time.
+
+    Returns
+    -------
+    image : ndarray, shape (height, width, 4)
+    extent : (float, float, float, float)
+    """
+    if extent is None:
+        extent = view_bounds(curves, distance, center)
+    colors = get_colors(n_array, M_c, cmap_name)
+    if isinstance(curves, InstancedAtom):
+        counts = totals = None
+        for k in range(len(curves)):
+            screen, depth = project(InstancedAtom(curves.carrier, curves.matrices[k:k + 1]),
+                                    phi, theta, distance, center)
+            counts, totals = accumulate(screen[0, :, 0], screen[0, :, 1], shape, extent, colors, how,
+                                        counts=counts, totals=totals)
+        return shade(counts, totals, how, log), extent
+    screen, depth = project(curves, phi, theta, distance, center)
+    screen = screen.reshape(-1, 2)
+    colors = np.tile(colors, (len(curves), 1))
+    counts, totals = accumulate(screen[:, 0], screen[:, 1], shape, extent, colors, how)
+    return shade(counts, totals, how, log), extent
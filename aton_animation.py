@@ -1,26 +1,14 @@
 from manim import *
 import numpy as np
 
+from atom import cached_carrier
+
 # -----------------------------------------------------------
 # Helper function to compute the "carrier" based on your formulas.
+# Served from atom's carrier cache, so repeated scenes share the work.
 # -----------------------------------------------------------
 def compute_carrier(N, D=4):
-    r_phi = 0.5 + np.sqrt(D+1) / 2
-    r_o = 1.0 / D
-    r_eta = 0.5 + 1j * np.sqrt(D-1) / 2  # equals e^(iπ/3)
-    t_o = D + 3 + 3 + 3
-    T_o = 4 * np.pi * (1 + np.sqrt(D+1))
-    Omega = 2 * np.pi / T_o
-    n_array = np.arange(N)
-    # Compute the sync factor tau and then alpha, beta, gamma
-    tau = r_o * r_eta * np.exp(-1j * Omega * (n_array + 1))
-    alpha = (r_o + t_o - ((n_array + 1) / (2 * r_o))) * np.real(tau)
-    beta  = (r_o + t_o - ((np.sqrt(D - 1) * (n_array + 1)) / 2)) * np.imag(tau)
-    gamma = alpha + 1j * beta
-    u = np.real(gamma)
-    v = np.imag(gamma)
-    w = np.log2(np.abs(gamma) + 1e-9)
-    return n_array, u, v, w, gamma, alpha, beta
+    return cached_carrier(N, D)
 
 # -----------------------------------------------------------
 # Main Manim Scene: AtomAnimation
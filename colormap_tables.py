@@ -0,0 +1,31 @@
+import numpy as np
+import matplotlib.pyplot as plt
+
+# =============================================================================
+# Colormap Lookup Tables
+# =============================================================================
+# Shared by the atom and compass modules. This module only samples colormaps;
+# it changes no matplotlib settings when imported.
+
+_colormap_luts = {}
+
+def colormap_lut(cmap, K):
+    """
+    RGBA lookup table of a colormap resampled to K colors, shape (K, 4).
+
+    ``cmap`` is a colormap name or a Colormap. Tables of named colormaps are
+    sampled once per (name, K), cached and shared read-only by every caller.
+    Colormap objects are sampled on every call: different objects can share
+    a name (e.g. 'from_list', or ``with_extremes`` copies).
+    """
+    if not isinstance(cmap, str):
+        lut = plt.get_cmap(cmap).resampled(K)(np.arange(K))
+        lut.flags.writeable = False
+        return lut
+    key = (cmap, K)
+    lut = _colormap_luts.get(key)
+    if lut is None:
+        lut = plt.get_cmap(cmap).resampled(K)(np.arange(K))
+        lut.flags.writeable = False
+        _colormap_luts[key] = lut
+    return lut
@@ -4,19 +4,28 @@ import calendar
 import random
 import matplotlib.pyplot as plt
 from matplotlib.path import Path
+from matplotlib.collections import PathCollection
+from matplotlib.transforms import IdentityTransform
 from matplotlib.text import TextPath
 from matplotlib import cm
 from mpl_toolkits.mplot3d import Axes3D
 from matplotlib import image
 import matplotlib.animation as animation
-from matplotlib.animation import FuncAnimation, FFMpegWriter
+from matplotlib.animation import FuncAnimation
 import warnings
+from functools import partial
+
+from colormap_tables import colormap_lut
+from level_of_detail import DetailPyramid, pixel_cells
+from video_export import save_scene
 warnings.filterwarnings("ignore")
 
 
 
-def compass(r,T,s):
-    return r*np.exp(1j*2*np.pi*s/T)
+def compass(r,T,s,dtype=None):
+    # dtype=np.complex64 rounds the float64 result once (compact mode).
+    z = r*np.exp(1j*2*np.pi*s/T)
+    return z if dtype is None else np.asarray(z, dtype=dtype)
 
 def init_atlas(sx,sy):
     
@@ -31,16 +40,13 @@ def see_atlas(atlas,symbol_size,symbol_shape):
 
 def color_atlas(atlas,symbol_size,symbol_shape,symbol_color,cmap,T_color):
     
-    get_color =  cm.get_cmap(cmap, T_color)
-    plt.scatter(atlas.real,atlas.imag,s=symbol_size,marker=symbol_shape,color=get_color(symbol_color%T_color))
+    plt.scatter(atlas.real,atlas.imag,s=symbol_size,marker=symbol_shape,color=lut_colors(cmap,T_color,symbol_color%T_color))
 
 def atlas_view(symbol,T_symbol,atlas,symbol_size,symbol_shape,symbol_color,cmap,T_color,char_flag,T_char,char_color,char_size,cmap_char):
     
-    get_color =  cm.get_cmap(cmap, T_color)
-    get_char_color = cm.get_cmap(cmap_char, T_char)
-    plt.scatter(atlas.real,atlas.imag,s=symbol_size,marker=symbol_shape,color=get_color(symbol_color%T_color))
+    plt.scatter(atlas.real,atlas.imag,s=symbol_size,marker=symbol_shape,color=lut_colors(cmap,T_color,symbol_color%T_color))
     if char_flag:
-        plt.text(atlas.real,atlas.imag,str(symbol%T_symbol),size=char_size,color=get_char_color(char_color%T_symbol))
+        plt.text(atlas.real,atlas.imag,str(symbol%T_symbol),size=char_size,color=lut_colors(cmap_char,T_char,char_color%T_symbol))
 
 
 
@@ -49,150 +55,237 @@ def compass_signed(r,T_pos,T_neg,s):
 
    return r*np.exp(1j*(np.pi/T_pos)*s) 
 
+def lut_colors(cmap,K,values):
+    # Same colors as cmap resampled to K called on values: integers index the
+    # cached table (clipped to it), floats are mapped by the colormap.
+    values = np.asarray(values)
+    if np.issubdtype(values.dtype, np.integer):
+        return colormap_lut(cmap,K)[np.clip(values,0,K-1)]
+    return plt.get_cmap(cmap).resampled(K)(values)
+
 def get_colors(symbol,cmap,variable_sizes,base_size):
-    
-    markers = ['o' if t >= 0 else 'd' for t in symbol]
-    norm = plt.Normalize(min(symbol), max(symbol))
-    colors = [cmap(norm(value)) for value in symbol]
+    # Arrays for the whole symbol sequence: markers (N,), colors (N,4), sizes (N,).
+    # The colormap call on the normalized array is a single vectorized lookup
+    # into the colormap's own table.
+    symbol = np.asarray(symbol)
+    markers = np.where(symbol >= 0, 'o', 'd')
+    norm = plt.Normalize(np.min(symbol), np.max(symbol))
     norm_seq =norm(symbol)
+    colors = cmap(norm_seq)
     if variable_sizes:
         sizes=(base_size+1)*np.abs(symbol)
     else:
         sizes=base_size*np.ones(len(symbol))
     return  markers,norm,colors,norm_seq,sizes
 
-def plot_atlas(atlas,symbol,cmap,alpha,sx,sy,variable_sizes,base_size):
+def scatter_atlas(atlas,markers,sizes,colors,alpha):
+    # One scatter call per marker group ('o' for symbols >= 0, 'd' otherwise)
+    # with per-point sizes and colors, instead of one call per point.
+    markers = np.asarray(markers)
+    colors = np.asarray(colors)
+    atlas = np.asarray(atlas)
+    for marker in ('o', 'd'):
+        group = markers == marker
+        if group.any():
+            plt.scatter(atlas[group].real, atlas[group].imag, s=np.asarray(sizes)[group], marker=marker, facecolor=colors[group], edgecolors='black', alpha=alpha)
+
+# Compact atlas points: one record per symbol holding the complex64 position,
+# uint8 RGBA color, float32 size and the symbol itself (int16 when the symbols
+# are small integers, float32 otherwise): 18 or 20 bytes per point instead of
+# the 64 of the complex128/float64/int64 arrays. Positions keep a relative precision of
+# 2^-24 and colors are rounded to uint8, within 1/510 of the colormap.
+
+def atlas_point_dtype(symbol_dtype=np.int16):
+    return np.dtype([('z', np.complex64), ('rgba', np.uint8, 4), ('size', np.float32), ('symbol', symbol_dtype)])
+
+def compact_symbols(symbol):
+    symbol = np.asarray(symbol)
+    small = np.iinfo(np.int16)
+    if symbol.size and np.all(np.mod(symbol, 1) == 0) and small.min <= symbol.min() and symbol.max() <= small.max:
+        return symbol.astype(np.int16)
+    return symbol.astype(np.float32)
+
+def compact_atlas(atlas,symbol,cmap,variable_sizes,base_size):
+    # Record array of the atlas with the colors and sizes of get_colors.
+    symbol = compact_symbols(symbol)
+    markers,norm,colors,norm_seq,sizes=get_colors(symbol,cmap,variable_sizes,base_size)
+    points = np.empty(len(symbol), dtype=atlas_point_dtype(symbol.dtype))
+    points['z'] = atlas
+    # Rounded (cmap(..., bytes=True) truncates, up to 1/255 off).
+    points['rgba'] = np.round(colors*255)
+    points['size'] = sizes
+    points['symbol'] = symbol
+    return points
+
+def plot_compact_atlas(points,alpha,sx,sy):
+    # plot_atlas for a compact_atlas record array.
+    init_atlas(sx,sy)
+    markers = np.where(points['symbol'] >= 0, 'o', 'd')
+    scatter_atlas(points['z'],markers,points['size'],points['rgba']/np.float32(255),alpha)
+
+def plot_atlas(atlas,symbol,cmap,alpha,sx,sy,variable_sizes,base_size,legend_flag=False):
     
     markers,norm,colors,norm_seq,sizes=get_colors(symbol,plt.cm.hsv,variable_sizes,base_size)
     
     init_atlas(sx,sy)
-    for i in range(len(atlas)):
-        plt.scatter(atlas[i].real, atlas[i].imag, color=colors[i], s=sizes[i], marker=markers[i], facecolor=colors[i], edgecolors='black', alpha=alpha)
+    scatter_atlas(atlas,markers,sizes,colors,alpha)
     if legend_flag:
-        cbar = plt.colorbar(plt.cm.ScalarMappable(norm=norm, cmap=cmap))
+        cbar = plt.colorbar(plt.cm.ScalarMappable(norm=norm, cmap=cmap), ax=plt.gca())
 
-def plot_atlas_text(atlas,symbol,cmap,alpha,sx,sy,legend_flag,variable_sizes,base_size):
+def plot_atlas_text(atlas,symbol,cmap,alpha,sx,sy,legend_flag,variable_sizes,base_size,aggregate_text=True,cull_overlap=False):
+    # aggregate_text draws all labels as one collection of cached glyphs;
+    # cull_overlap additionally drops labels that would overlap an earlier one.
     markers,norm,colors,norm_seq,sizes=get_colors(symbol,cmap,variable_sizes,base_size)
     
     init_atlas(sx,sy)
-    for i in range(len(atlas)):
-        plt.scatter(atlas[i].real, atlas[i].imag, color=colors[i], s=sizes[i], marker=markers[i], facecolor=colors[i], edgecolors='black', alpha=alpha)
-        plt.text(atlas[i].real, atlas[i].imag,str(symbol[i]),size=sizes[i],c=colors[i])
+    scatter_atlas(atlas,markers,sizes,colors,alpha)
+    if aggregate_text:
+        ax = plt.gca()
+        offsets = np.column_stack((np.real(atlas), np.imag(atlas)))
+        keep = slice(None)
+        if cull_overlap:
+            ax.autoscale_view()
+            keep = non_overlapping(ax.transData.transform(offsets), sizes * ax.figure.dpi / 72)
+        glyphs = glyph_paths(np.asarray(symbol)[keep], sizes[keep])
+        add_labels(ax, offsets[keep], glyphs, colors[keep])
+    else:
+        for i in range(len(atlas)):
+            plt.text(atlas[i].real, atlas[i].imag,str(symbol[i]),size=sizes[i],c=colors[i])
     if legend_flag:
-        cbar = plt.colorbar(plt.cm.ScalarMappable(norm=norm, cmap=cmap))
+        cbar = plt.colorbar(plt.cm.ScalarMappable(norm=norm, cmap=cmap), ax=plt.gca())
 
 # Animations
 
-def get_atlas_video(atlas_in, symbol, fps, colormap, output_path, variable_size, fixed_size,padding,sx,sy):
-    
-    
-    
-    
-    markers, norm, colors, norm_seq, sizes = get_colors(symbol, colormap, variable_size, fixed_size)
-
-    
-
-    fig, ax = plt.subplots(figsize=(sx, sy))
-    scatter = ax.scatter([], [], color=[], s=[], edgecolors='black', alpha=0.5)
-
-    frames = len(atlas_in)
-    x_values = []
-    y_values = []
-    sizes_values = []
-    colors_values = []
-    markers_values = []
-
-    def update(frame):
-        # Accumulate coordinates, sizes, colors, and markers from all previous frames
-        x_values.extend([atlas_in[frame].real])
-        y_values.extend([atlas_in[frame].imag])
-        sizes_values.extend([sizes[frame]])
-        colors_values.extend([colors[frame]])
-        markers_values.extend([symbol[frame]])
-
-        # Update the scatter plot with accumulated coordinates, sizes, colors, and markers
-        scatter.set_offsets(np.column_stack((x_values, y_values)))
-        scatter.set_sizes(sizes_values)
-        scatter.set_color(colors_values)
-        scatter.set_edgecolors('black')
-        scatter.set_alpha(0.5)
-
-        # Determine marker based on the value of the symbol for all frames
-        marker_paths = []
-        for marker in markers_values:
-            if marker >= 0:
-                marker_path = Path.unit_circle()
-            else:
-                marker_path = Path.unit_regular_polygon(4)
-            marker_paths.append(marker_path)
-
-        scatter.set_paths(marker_paths)
-
-        # Adjust the axis limits based on the data
-        ax.set_xlim(np.min(x_values) - padding, np.max(x_values) + padding)
-        ax.set_ylim(np.min(y_values) - padding, np.max(y_values) + padding)
-
-    animation = FuncAnimation(fig, update, frames=frames, blit=False)
-
-    # Specify the writer (FFMpegWriter) and the output filename
-    writer = FFMpegWriter(fps=fps)  # Adjust the frames per second (fps) as needed
-    animation.save(output_path, writer=writer)
-
-
-def get_atlas_video_text(atlas_in, symbol, fps, colormap, output_path, variable_size, fixed_size, padding, sx, sy, text_size, alpha):
+_glyph_cache = {}
+
+def glyph_path(text, size):
+    # Laid-out outline of a label string, computed once per (text, size) and
+    # shared by every label showing that string.
+    key = (text, size)
+    if key not in _glyph_cache:
+        _glyph_cache[key] = TextPath((0, 0), text, size=size)
+    return _glyph_cache[key]
+
+def glyph_paths(symbol, size):
+    # Object array with the cached glyph of every symbol; size may be a
+    # scalar or one size per symbol.
+    size = np.broadcast_to(size, np.shape(symbol))
+    pairs, inverse = np.unique(np.column_stack((symbol, size)), axis=0, return_inverse=True)
+    glyphs = [glyph_path(str(symbol.dtype.type(value)), float(s)) for value, s in pairs]
+    return np.array(glyphs, dtype=object)[inverse.ravel()]
+
+def add_labels(ax, offsets, glyphs, colors):
+    # All labels as one PathCollection of glyph outlines anchored (left,
+    # baseline) at the data offsets, drawn above the markers and unclipped
+    # like ax.text.
+    labels = PathCollection(list(glyphs), sizes=[1], offsets=offsets, offset_transform=ax.transData,
+                            facecolors=colors, edgecolors='none', zorder=3, clip_on=False)
+    ax.add_collection(labels, autolim=False)
+    # Glyphs are laid out in points around each offset, like scatter markers
+    labels.set_transform(IdentityTransform())
+    return labels
+
+def non_overlapping(points, cell):
+    # Mask keeping the first label of each screen cell, so that labels do not
+    # pile up on top of each other. All labels share one grid whose cells are
+    # as large as the largest label (cell may be one size per label, in
+    # pixels); per-label grids would not line up.
+    size = max(np.max(cell, initial=1), 1)
+    cells = np.floor(np.asarray(points) / size).astype(np.int64)
+    keep = np.zeros(len(points), dtype=bool)
+    keep[np.unique(cells, axis=0, return_index=True)[1]] = True
+    return keep
+
+def atlas_video_scene(atlas_in, symbol, colormap, variable_size, fixed_size, padding, sx, sy, alpha=0.5, text_size=None, max_labels=None, lod=False, lod_resolution=None):
+    # Figure and update function of get_atlas_video. update(frame) shows the
+    # symbols 0..frame and only depends on frame, so frames can be rendered
+    # in any order (see video_export). Everything a frame needs is computed
+    # once up front, so each update only takes slices (views) of it.
+    #
+    # With text_size set, every symbol is also labelled with its value. The
+    # labels are one PathCollection of cached glyph outlines (one per distinct
+    # string) anchored at the symbols, instead of one Text artist per label.
+    # Only the max_labels most recent labels are kept (the view always holds
+    # every symbol shown so far, so none are outside it).
+    #
+    # With lod, symbols sharing a half-pixel cell of the current view (for
+    # lod_resolution pixels across each axis, default the larger figure side)
+    # are drawn once, keeping the one painted on top (see level_of_detail), so
+    # zoomed-out frames cost about their pixel count. Only the edges of larger
+    # markers under a later one can show.
     markers, norm, colors, norm_seq, sizes = get_colors(symbol, colormap, variable_size, fixed_size)
+    offsets = np.column_stack((atlas_in.real, atlas_in.imag))
+    # Two shared marker paths, one per sign, referenced from an object array
+    marker_paths = np.where(symbol >= 0, 0, 1)
+    marker_paths = np.array([Path.unit_circle(), Path.unit_regular_polygon(4)], dtype=object)[marker_paths]
+    # Running bounds of all symbols up to each frame
+    x_min = np.minimum.accumulate(offsets[:, 0]) - padding
+    x_max = np.maximum.accumulate(offsets[:, 0]) + padding
+    y_min = np.minimum.accumulate(offsets[:, 1]) - padding
+    y_max = np.maximum.accumulate(offsets[:, 1]) + padding
 
     fig, ax = plt.subplots(figsize=(sx, sy))
     scatter = ax.scatter([], [], color=[], s=[], edgecolors='black', alpha=alpha)
 
-    frames = len(atlas_in)
-    x_values = []
-    y_values = []
-    sizes_values = []
-    colors_values = []
-    markers_values = []
+    pyramid = None
+    if lod:
+        limits = np.stack((np.column_stack((x_min, x_max)), np.column_stack((y_min, y_max))), axis=1)
+        cells = pixel_cells(limits, lod_resolution or max(sx, sy) * fig.dpi)
+        pyramid = DetailPyramid(offsets, cells)
+
+    labels = None
+    if text_size is not None:
+        glyphs = glyph_paths(symbol, text_size)
+        labels = add_labels(ax, np.empty((0, 2)), [], np.empty((0, 4)))
 
     def update(frame):
-        x_values.clear()
-        y_values.clear()
-        sizes_values.clear()
-        colors_values.clear()
-        markers_values.clear()
-
-        for i in range(frame + 1):
-            x_values.append(atlas_in[i].real)
-            y_values.append(atlas_in[i].imag)
-            sizes_values.append(sizes[i])
-            colors_values.append(colors[i])
-            markers_values.append(markers[i])
-
-        scatter.set_offsets(np.column_stack((x_values, y_values)))
-        scatter.set_sizes(sizes_values)
-        scatter.set_color(colors_values)
+        # Coordinates, sizes, colors, and markers of all frames so far
+        shown = slice(0, frame + 1) if pyramid is None else pyramid.indices(frame + 1, cells[frame])
+        scatter.set_offsets(offsets[shown])
+        scatter.set_sizes(sizes[shown])
+        scatter.set_color(colors[shown])
         scatter.set_edgecolors('black')
         scatter.set_alpha(alpha)
+        scatter.set_paths(marker_paths[shown])
 
-        marker_paths = []
-        for marker in markers_values:
-            if marker == 'o':
-                marker_path = Path.unit_circle()
-            else:
-                marker_path = Path.unit_regular_polygon(4)
-            marker_paths.append(marker_path)
+        # Adjust the axis limits based on the data
+        ax.set_xlim(x_min[frame], x_max[frame])
+        ax.set_ylim(y_min[frame], y_max[frame])
 
-        scatter.set_paths(marker_paths)
+        if labels is not None:
+            first = 0 if max_labels is None else max(0, frame + 1 - max_labels)
+            window = slice(first, frame + 1)
+            labels.set_offsets(offsets[window])
+            labels.set_paths(glyphs[window])
+            labels.set_facecolor(colors[window])
 
-        ax.set_xlim(np.min(x_values) - padding, np.max(x_values) + padding)
-        ax.set_ylim(np.min(y_values) - padding, np.max(y_values) + padding)
+    return fig, update
 
-        # Plot scatter coordinates text
-        for i, (x, y, sym, color) in enumerate(zip(x_values, y_values, symbol[: frame + 1], colors_values)):
-            ax.text(x, y, str(sym), color=color, fontsize=text_size)
+def get_atlas_video(atlas_in, symbol, fps, colormap, output_path, variable_size, fixed_size,padding,sx,sy,workers=None,backend='writer',codec=None,crf=None,lod=False,lod_resolution=None):
+    
+    # With workers set, frames are rendered on that many processes
+    # (0 = every core) by video_export, giving the same video as the serial path.
+    # backend='pipe' writes the Agg canvas buffers straight into ffmpeg
+    # (with optional codec and crf) and reports the frame throughput.
+    # lod draws each frame at screen resolution (see atlas_video_scene).
+    atlas_in = np.asarray(atlas_in)
+    symbol = np.asarray(symbol)
+    frames = len(atlas_in)
+    build_scene = partial(atlas_video_scene, atlas_in, symbol, colormap, variable_size, fixed_size, padding, sx, sy,
+                          lod=lod, lod_resolution=lod_resolution)
+    save_scene(build_scene, frames, output_path, fps, workers, backend, codec, crf)
 
-    animation = FuncAnimation(fig, update, frames=frames, blit=False)
 
-    writer = FFMpegWriter(fps=fps)
-    animation.save(output_path, writer=writer)
+def get_atlas_video_text(atlas_in, symbol, fps, colormap, output_path, variable_size, fixed_size, padding, sx, sy, text_size, alpha, max_labels=None, workers=None, backend='writer', codec=None, crf=None, lod=False, lod_resolution=None):
+    # Like get_atlas_video, with every symbol labelled by its value. Each label
+    # glyph is laid out once; max_labels bounds how many recent labels are drawn.
+    # workers, backend='pipe' (with codec and crf) and lod as in get_atlas_video.
+    atlas_in = np.asarray(atlas_in)
+    symbol = np.asarray(symbol)
+    frames = len(atlas_in)
+    scene_args = (atlas_in, symbol, colormap, variable_size, fixed_size, padding, sx, sy, alpha, text_size, max_labels,
+                  lod, lod_resolution)
+    save_scene(partial(atlas_video_scene, *scene_args), frames, output_path, fps, workers, backend, codec, crf)
 
 
 
@@ -230,7 +323,89 @@ def extract_climate_data(df):
     
     return year, month, day, hour, minute, second, temperature, humidity, pressure
 
+# Calendar lookup tables: days of each month in common and leap years, and
+# whether each year of the 400-year Gregorian cycle is a leap year.
+MONTH_DAYS = np.array([[calendar.monthrange(2023, m)[1] for m in range(1, 13)],
+                       [calendar.monthrange(2024, m)[1] for m in range(1, 13)]], dtype=np.int32)
+LEAP_CYCLE = np.array([calendar.isleap(y) for y in range(400)])
+
 def month_range(year, month):
-    if month == 2 and calendar.isleap(year):
-        return 29
-    return calendar.monthrange(year, month)[1]
+    return int(MONTH_DAYS[int(LEAP_CYCLE[year % 400]), month - 1])
+
+def is_leap(year):
+    return LEAP_CYCLE[np.asarray(year) % 400]
+
+def days_in_month(year, month):
+    # Vectorized month_range for arrays of years and months (1-12).
+    return MONTH_DAYS[is_leap(year).astype(np.intp), np.asarray(month) - 1]
+
+
+# Time atlas: nested year/month/day/hour/... dials for a DatetimeIndex
+
+TIME_LEVELS = ('year', 'month', 'day', 'hour', 'minute', 'second')
+TIME_PERIODS = {'month': 12, 'day': 31, 'hour': 24, 'minute': 60, 'second': 60}
+
+def time_parts(index, levels=TIME_LEVELS):
+    # int32 calendar fields of a DatetimeIndex (wall time for tz-aware ones),
+    # from datetime64 unit truncation instead of one pandas accessor per field.
+    # NaT has no calendar fields (its int64 value would give garbage ones).
+    index = pd.DatetimeIndex(index)
+    if index.hasnans:
+        rows = np.flatnonzero(index.isna())
+        raise ValueError(f"{len(rows)} missing timestamp(s) (NaT), first at row {rows[0]}; "
+                         "drop or fill them before mapping times onto an atlas")
+    if index.tz is not None:
+        index = index.tz_localize(None)
+    t = index.values.astype('datetime64[s]')
+    Y = t.astype('datetime64[Y]')
+    M = t.astype('datetime64[M]')
+    D = t.astype('datetime64[D]')
+    seconds = (t - D).astype(np.int32)
+    fields = {'year': lambda: Y.astype(np.int32) + 1970,
+              'month': lambda: (M - Y).astype(np.int32) + 1,
+              'day': lambda: (D - M).astype(np.int32) + 1,
+              'hour': lambda: seconds // 3600,
+              'minute': lambda: seconds // 60 % 60,
+              'second': lambda: seconds % 60}
+    return {level: fields[level]() for level in levels}
+
+def dial_table(r, T):
+    # compass(r,T,s) for s = 0..T-1, so integer positions become a lookup.
+    return compass(r, T, np.arange(T))
+
+def time_atlas(index, levels=('year', 'month', 'day', 'hour'), radii=1, periods=None, parts=None, dtype=complex):
+    # Atlas A = sum over levels of compass(r_k, T_k, s_k) for every timestamp,
+    # where s_k is the calendar field of level k (as in the galaxia_Tau
+    # notebook). radii is one radius for all dials or one per level (dict or
+    # sequence); periods overrides TIME_PERIODS per level. The default year
+    # period is the number of years spanned, and the day period 'month' uses
+    # the length of each row's own month. Integer periods index precomputed
+    # dial tables, so no exp() is evaluated per row. parts may hold fields
+    # already extracted with time_parts; missing ones are extracted here.
+    # dtype=np.complex64 accumulates in compact precision (the dial tables
+    # themselves are still computed in float64).
+    needed = set(levels) | ({'year', 'month'} if 'day' in levels else set())
+    parts = dict(parts or {})
+    missing = needed - set(parts)
+    if missing:
+        parts.update(time_parts(index, [level for level in TIME_LEVELS if level in missing]))
+    periods = dict(TIME_PERIODS, **(periods or {}))
+    if 'year' in levels and 'year' not in periods:
+        periods['year'] = int(parts['year'].max() - parts['year'].min() + 1) if len(index) else 1
+    if not isinstance(radii, dict):
+        radii = dict(zip(levels, np.broadcast_to(radii, len(levels))))
+    atlas = np.zeros(len(index), dtype=dtype)
+    for level in levels:
+        r, T, s = radii[level], periods[level], parts[level]
+        if level == 'day' and T == 'month':
+            # One dial of 28, 29, 30 and 31 days, selected per row.
+            lengths = days_in_month(parts['year'], parts['month'])
+            tables = np.zeros((4, 31), dtype=complex)
+            for T_d in range(28, 32):
+                tables[T_d - 28, :T_d] = dial_table(r, T_d)
+            atlas += tables[lengths - 28, s % lengths]
+        elif float(T).is_integer():
+            atlas += dial_table(r, int(T))[s % int(T)]
+        else:
+            atlas += compass(r, T, s)
+    return atlas
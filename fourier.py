@@ -0,0 +1,375 @@
+from functools import partial
+
+import numpy as np
+import matplotlib.pyplot as plt
+from matplotlib.animation import FuncAnimation
+from matplotlib.collections import EllipseCollection
+from scipy.fft import fft, ifft
+
+from video_export import save_scene
+
+# =============================================================================
+# Fourier Series Engine
+# =============================================================================
+# Coefficients follow the notebooks' definition (escenas.ipynb,
+# galaxia_Tau.ipynb):
+#
+#     c_n = (1/Tp) * trapz(x * exp(-2πi n t / Tp), dx=dt),   n = -N .. N-1
+#
+# and the approximation is  sum_n c_n exp(2πi n t / Tp)  on the same t.
+#
+# When the samples are equally spaced with a step h such that Tp = L*h for an
+# integer L (e.g. t = np.linspace(-Tp/2, Tp/2, M), where L = M-1), every
+# exp(-2πi n t_j / Tp) only depends on j mod L and n mod L. The weighted
+# samples are then folded onto L bins and a single FFT of length L gives all
+# the coefficients at once; the reconstruction is the mirror image with one
+# inverse FFT. Other grids fall back to a single (chunked) matrix product.
+
+def trapezoid_weights(t, dt=None):
+    """
+    Weights w such that ``w @ f`` equals ``np.trapz(f, t)`` (or
+    ``np.trapz(f, dx=dt)`` when ``dt`` is given).
+    """
+    M = len(t)
+    if dt is not None:
+        h = np.full(M - 1, float(dt))
+    else:
+        h = np.diff(np.asarray(t, dtype=np.float64))
+    # Each sample gets half of the interval on either side of it.
+    w = np.zeros(M)
+    w[:-1] += h / 2
+    w[1:] += h / 2
+    return w
+
+def fft_period(t, Tp, rtol=1e-9):
+    """
+    Number of samples L per period if ``t`` is equally spaced with ``Tp`` an
+    integer multiple of the step, else None.
+    """
+    t = np.asarray(t, dtype=np.float64)
+    if len(t) < 2:
+        return None
+    h = (t[-1] - t[0]) / (len(t) - 1)
+    if h <= 0 or not np.allclose(np.diff(t), h, rtol=rtol, atol=0):
+        return None
+    L = int(round(Tp / h))
+    if L < 1 or abs(L * h - Tp) > rtol * Tp:
+        return None
+    return L
+
+def fourier_coefficients(x, t, dt, Tp, N, chunk_size=256):
+    """
+    Fourier coefficients c_n for n = -N .. N-1 in one pass.
+
+    Drop-in replacement for the notebooks' ``coeficientes``/``c`` (same
+    arguments, same trapezoid normalization, same order).
+
+    Parameters
+    ----------
+    x : ndarray
+        Real or complex samples.
+    t : ndarray
+        Sample times.
+    dt : float or None
+        Step passed to the trapezoid rule as ``dx`` (``None`` integrates over
+        ``t`` itself).
+    Tp : float
+        Period.
+    N : int
+        Coefficients -N .. N-1 are returned.
+    chunk_size : int
+        Coefficients per matrix product on grids the FFT cannot handle.
+
+    Returns
+    -------
+    c : ndarray of complex, shape (2N,)
+        ``c[N + n]`` is the coefficient of exp(2πi n t / Tp).
+    """
+    t = np.asarray(t, dtype=np.float64)
+    y = trapezoid_weights(t, dt) * np.asarray(x) / Tp
+    n = np.arange(-N, N)
+    L = fft_period(t, Tp)
+    if L is not None:
+        folded = np.zeros(L, dtype=np.complex128)
+        np.add.at(folded, np.arange(len(t)) % L, y)
+        spectrum = fft(folded)
+        # exp(-2πi n t_j/Tp) = exp(-2πi n t_0/Tp) * exp(-2πi n j/L)
+        return np.exp(-2j * np.pi * n * (t[0] / Tp)) * spectrum[n % L]
+    c = np.empty(2 * N, dtype=np.complex128)
+    for lo in range(0, 2 * N, chunk_size):
+        k = n[lo:lo + chunk_size]
+        c[lo:lo + chunk_size] = np.exp(-2j * np.pi * np.outer(k, t) / Tp) @ y
+    return c
+
+def fourier_series(c, t, Tp, chunk_size=256):
+    """
+    Evaluate sum_n c_n exp(2πi n t / Tp) for n = -N .. N-1, with N = len(c)//2.
+
+    Parameters
+    ----------
+    c : ndarray, shape (2N,)
+        Coefficients as returned by ``fourier_coefficients``.
+    t : ndarray
+        Times at which to evaluate the series.
+    Tp : float
+        Period.
+    chunk_size : int
+        Coefficients per matrix product on grids the FFT cannot handle.
+
+    Returns
+    -------
+    out : ndarray of complex, same length as t
+    """
+    t = np.asarray(t, dtype=np.float64)
+    c = np.asarray(c, dtype=np.complex128)
+    N = len(c) // 2
+    n = np.arange(-N, N)
+    L = fft_period(t, Tp)
+    if L is not None:
+        # exp(2πi n t_j/Tp) = exp(2πi n t_0/Tp) * exp(2πi n j/L)
+        folded = np.zeros(L, dtype=np.complex128)
+        np.add.at(folded, n % L, c * np.exp(2j * np.pi * n * (t[0] / Tp)))
+        return (L * ifft(folded))[np.arange(len(t)) % L]
+    out = np.zeros(len(t), dtype=np.complex128)
+    for lo in range(0, 2 * N, chunk_size):
+        k = n[lo:lo + chunk_size]
+        out += c[lo:lo + chunk_size] @ np.exp(2j * np.pi * np.outer(k, t) / Tp)
+    return out
+
+def fourier_approximation(x, t, dt, Tp, N):
+    """
+    Truncated Fourier series of x with coefficients -N .. N-1, evaluated on t.
+
+    Drop-in replacement for the notebooks' ``aprox_fourier``/``rek_c``.
+    """
+    return fourier_series(fourier_coefficients(x, t, dt, Tp, N), t, Tp)
+
+# =============================================================================
+# Progressive Partial Sums (convergence animations)
+# =============================================================================
+# S_K = sum_{n=-K}^{K-1} c_n exp(2πi n t/Tp) is ``fourier_approximation`` with
+# N = K. Going from S_{K-1} to S_K only adds the terms n = -K and n = K-1, so a
+# sweep over K = 1, 2, ... costs O(len(t)) per step instead of O(K len(t)).
+
+def add_partial_terms(out, c, t, Tp, K_from, K_to):
+    """
+    Turn ``out`` = S_{K_from} into S_{K_to} in place (K_to >= K_from).
+
+    ``c`` holds coefficients -N .. N-1 as returned by ``fourier_coefficients``
+    (N >= K_to).
+    """
+    N = len(c) // 2
+    phase = 2j * np.pi * np.asarray(t, dtype=np.float64) / Tp
+    for K in range(K_from + 1, K_to + 1):
+        out += c[N - K] * np.exp(-K * phase)
+        out += c[N + K - 1] * np.exp((K - 1) * phase)
+    return out
+
+def iter_partial_sums(c, t, Tp, terms=None):
+    """
+    Yield the partial sums S_K for increasing K from one set of coefficients.
+
+    Parameters
+    ----------
+    c : ndarray, shape (2N,)
+        Coefficients as returned by ``fourier_coefficients``.
+    t : ndarray
+        Times at which to evaluate the sums.
+    Tp : float
+        Period.
+    terms : iterable of int, optional
+        Increasing values of K (default: 1 .. N).
+
+    Yields
+    ------
+    K : int
+    S : ndarray of complex
+        S_K on t. This is a running buffer updated in place; copy it to keep
+        it past the next step.
+    """
+    N = len(c) // 2
+    out = np.zeros(len(t), dtype=np.complex128)
+    K = 0
+    for K_next in (range(1, N + 1) if terms is None else terms):
+        if K_next < K:
+            raise ValueError("terms must be increasing")
+        add_partial_terms(out, c, t, Tp, K, K_next)
+        K = K_next
+        yield K, out
+
+def fourier_convergence_scene(x, t, dt, Tp, terms, figsize=(16, 8)):
+    """
+    Figure and update function of a Fourier convergence animation.
+
+    ``update(frame)`` plots the signal and its partial sum S_K with
+    K = terms[frame]. Consecutive frames only add the new terms to a running
+    sum; any other jump rebuilds it with ``fourier_series``, so the result
+    never depends on which frames came before (see ``video_export``).
+    """
+    terms = np.asarray(terms)
+    c = fourier_coefficients(x, t, dt, Tp, int(terms.max()))
+    N = len(c) // 2
+    fig, ax = plt.subplots(figsize=figsize)
+    ax.plot(t, np.real(x))
+    line, = ax.plot(t, np.zeros(len(t)), 'r')
+    title = ax.set_title('')
+    state = {"K": 0, "S": np.zeros(len(t), dtype=np.complex128)}
+
+    def update(frame):
+        K = int(terms[frame])
+        if K >= state["K"]:
+            add_partial_terms(state["S"], c, t, Tp, state["K"], K)
+        else:
+            state["S"] = fourier_series(c[N - K:N + K], t, Tp)
+        state["K"] = K
+        line.set_ydata(state["S"].real)
+        title.set_text(f"N_terminos = {K}")
+        return line, title
+
+    return fig, update
+
+def animate_fourier_convergence(x, t, dt, Tp, terms, video_file=None, fps=25, frame_interval=40,
+                                figsize=(16, 8), workers=None, backend='writer', codec=None, crf=None):
+    """
+    Animate the convergence of the Fourier series of x over K in ``terms``.
+
+    Parameters
+    ----------
+    x, t, dt, Tp :
+        Signal, times, trapezoid step and period, as in ``fourier_coefficients``.
+    terms : sequence of int
+        Number of terms K of each frame, e.g. ``range(1, 1001)``.
+    video_file : str or None
+        If provided, the animation is saved to this file.
+    fps, frame_interval :
+        Video frame rate and interactive frame interval (ms).
+    workers, backend, codec, crf :
+        Video export options, as in ``atom.animate_atom``.
+    """
+    build_scene = partial(fourier_convergence_scene, x, t, dt, Tp, terms, figsize)
+    if video_file:
+        save_scene(build_scene, len(terms), video_file, fps, workers, backend, codec, crf)
+        return
+
+    fig, update = build_scene()
+    ani = FuncAnimation(fig, update, frames=len(terms), interval=frame_interval, blit=False)
+    plt.show()
+
+# =============================================================================
+# Epicycle (Ptolemy) Chains
+# =============================================================================
+# A chain of K rotating arms c_k exp(i ω f_k t) drawn tip to tail. Column j of
+# the (T, K) array of cumulative sums is the tip of arm j, i.e. the center of
+# circle j+1, for every time sample at once; the last column traces the curve.
+# With coefficients from ``fourier_coefficients`` (frequencies -N .. N-1 and
+# ω = 2π/Tp) the tip is ``fourier_series``.
+
+def epicycle_frequencies(K):
+    """Default frequencies -K//2 .. K - K//2 - 1, the order of ``fourier_coefficients``."""
+    return np.arange(-(K // 2), K - K // 2)
+
+def sort_epicycles(c, frequencies=None):
+    """
+    Coefficients and frequencies ordered by decreasing magnitude (ties keep
+    their order), the usual largest-circle-first epicycle drawing.
+    """
+    c = np.asarray(c)
+    frequencies = epicycle_frequencies(len(c)) if frequencies is None else np.asarray(frequencies)
+    order = np.argsort(-np.abs(c), kind='stable')
+    return c[order], frequencies[order]
+
+def iter_epicycle_chain(c, t, frequencies=None, omega=1.0, sort=False, chunk_size=4096):
+    """
+    Yield the chain centers ``chunk_size`` time samples at a time.
+
+    Yields
+    ------
+    lo : int
+        Index of the first time sample of the chunk.
+    centers : ndarray of complex, shape (chunk, K)
+        See ``epicycle_chain``.
+    """
+    c = np.asarray(c, dtype=np.complex128)
+    if sort:
+        c, frequencies = sort_epicycles(c, frequencies)
+    elif frequencies is None:
+        frequencies = epicycle_frequencies(len(c))
+    rate = 1j * omega * np.asarray(frequencies, dtype=np.float64)
+    t = np.asarray(t, dtype=np.float64)
+    for lo in range(0, len(t), chunk_size):
+        arms = c * np.exp(np.outer(t[lo:lo + chunk_size], rate))
+        yield lo, np.cumsum(arms, axis=1, out=arms)
+
+def epicycle_chain(c, t, frequencies=None, omega=1.0, sort=False, chunk_size=None, out=None):
+    """
+    Cumulative circle centers of an epicycle chain for all time samples.
+
+    Parameters
+    ----------
+    c : ndarray, shape (K,)
+        Complex arm coefficients (radius and initial angle of each circle).
+    t : ndarray, shape (T,)
+        Time samples, e.g. ``np.linspace(0, 2*np.pi, 360)``.
+    frequencies : ndarray, shape (K,), optional
+        Frequency of each arm (default: ``epicycle_frequencies(K)``).
+    omega : float
+        Angular frequency scale (2π/Tp for Fourier coefficients of period Tp).
+    sort : bool
+        Order the arms by decreasing magnitude (see ``sort_epicycles``).
+    chunk_size : int, optional
+        Evaluate this many time samples at a time, bounding the temporary
+        memory for large T*K (e.g. when ``out`` is a memmap).
+    out : ndarray, shape (T, K), optional
+        Array to write the centers into.
+
+    Returns
+    -------
+    centers : ndarray of complex, shape (T, K)
+        ``centers[:, j] = sum_{k<=j} c_k exp(i ω f_k t)``; the last column is
+        the traced curve.
+    """
+    T = len(t)
+    if out is None:
+        out = np.empty((T, len(c)), dtype=np.complex128)
+    for lo, centers in iter_epicycle_chain(c, t, frequencies, omega, sort, chunk_size or max(T, 1)):
+        out[lo:lo + len(centers)] = centers
+    return out
+
+def epicycle_scene(c, t, frequencies=None, omega=1.0, sort=True, figsize=(12, 12),
+                   circle_color='gray', arm_color='C0', trace_color='r'):
+    """
+    Figure and update function of an epicycle animation.
+
+    All centers are computed once with ``epicycle_chain``; ``update(frame)``
+    moves the circles (one EllipseCollection) and arms to time sample
+    ``frame`` and draws the trace up to it.
+    """
+    c = np.asarray(c, dtype=np.complex128)
+    if sort:
+        c, frequencies = sort_epicycles(c, frequencies)
+    centers = epicycle_chain(c, t, frequencies, omega)
+    # Circle k is centered on the tip of the arms before it
+    chain = np.concatenate((np.zeros((len(t), 1), dtype=np.complex128), centers), axis=1)
+    radii = np.abs(c)
+    tips = centers[:, -1]
+    extent = radii.sum() * 1.1
+
+    fig, ax = plt.subplots(figsize=figsize)
+    ax.set_xlim(-extent, extent)
+    ax.set_ylim(-extent, extent)
+    ax.set_aspect('equal')
+    ax.set_axis_off()
+    circles = EllipseCollection(2 * radii, 2 * radii, np.zeros(len(c)), units='xy',
+                                offsets=np.zeros((len(c), 2)), offset_transform=ax.transData,
+                                facecolors='none', edgecolors=circle_color, linewidths=0.5)
+    ax.add_collection(circles, autolim=False)
+    arms, = ax.plot([], [], color=arm_color, lw=1)
+    trace, = ax.plot([], [], color=trace_color, lw=1.5)
+
+    def update(frame):
+        circles.set_offsets(np.column_stack((chain[frame, :-1].real, chain[frame, :-1].imag)))
+        arms.set_data(chain[frame].real, chain[frame].imag)
+        trace.set_data(tips[:frame + 1].real, tips[:frame + 1].imag)
+        return circles, arms, trace
+
+    return fig, update
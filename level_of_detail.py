@@ -0,0 +1,123 @@
+import numpy as np
+
+# =============================================================================
+# Level-of-detail Decimation (multi-resolution pyramid of ordered points)
+# =============================================================================
+# Zoomed-out animation frames draw thousands of points of a curve into the
+# same screen pixel. A pyramid level snaps the points to a grid of square
+# cells of side 2^k, and a frame uses the coarsest level whose cells are no
+# larger than half a screen pixel (see ``pixel_cells``):
+#
+# - scatter plots keep, among the points drawn so far, only the last point
+#   of every occupied cell (the one painted on top). Each level stores the
+#   index of the next point in the same cell, so the points of frame ``stop``
+#   are those before ``stop`` whose next point is not (one comparison);
+# - line plots keep the first and last point of every run of consecutive
+#   points inside one cell, so the polyline differs from the full one by
+#   less than one cell. Kept indices are stored sorted, so a frame is one
+#   binary search and a slice.
+#
+# Frames are therefore visually the same as the full ones: markers move by
+# less than half a pixel, which only changes the antialiasing of their edges
+# (within about 30/255 for small opaque markers on a 300-pixel atlas video;
+# a one-pixel cell roughly triples that), and translucent markers stacked
+# inside one pixel look lighter. The number of drawn points is bounded by the
+# cells the view can show instead of by the number of points.
+
+def pixel_cells(limits, resolution, pixels=0.5):
+    """
+    Largest cell size (in data units) that stays within ``pixels`` screen
+    pixels on every axis, for each frame.
+
+    Parameters
+    ----------
+    limits : ndarray, shape (F, D, 2)
+        (low, high) axis limits of each frame, e.g. ``atom.frame_limits``.
+    resolution : float
+        Screen pixels spanned by the axes (e.g. figure width times dpi).
+    pixels : float
+        Maximum cell size in pixels.
+
+    Returns
+    -------
+    cells : ndarray, shape (F,)
+    """
+    limits = np.asarray(limits, dtype=np.float64)
+    return pixels * (limits[..., 1] - limits[..., 0]).min(axis=-1) / resolution
+
+def _next_in_cell(ids):
+    # Index of the next point with the same cell ids (len(ids) if none).
+    shape = np.ptp(ids, axis=0) + 1
+    if np.prod(shape.astype(np.float64)) < 2**62:
+        keys = np.ravel_multi_index((ids - ids.min(axis=0)).T, tuple(shape))
+    else:
+        keys = np.unique(ids, axis=0, return_inverse=True)[1].ravel()
+    order = np.argsort(keys, kind='stable')
+    same = keys[order[1:]] == keys[order[:-1]]
+    following = np.full(len(ids), len(ids), dtype=np.int64)
+    following[order[:-1][same]] = order[1:][same]
+    return following
+
+class DetailPyramid:
+    """
+    Decimated index sets of an ordered point sequence at power-of-two cells.
+
+    Parameters
+    ----------
+    points : ndarray, shape (N, D)
+        Points in drawing order (a curve, or the atlas points as (x, y)).
+    cells : array_like
+        Cell sizes that will be requested (e.g. ``pixel_cells`` of every
+        frame); levels are built from the largest power of two not above the
+        smallest of them up to the largest of them.
+    """
+
+    def __init__(self, points, cells):
+        points = np.asarray(points, dtype=np.float64)
+        if points.ndim == 1:
+            points = points[:, None]
+        cells = np.asarray(cells, dtype=np.float64)
+        cells = cells[np.isfinite(cells) & (cells > 0)]
+        self.size = len(points)
+        self.levels = {}
+        if len(cells) == 0 or self.size == 0:
+            self.min_level = self.max_level = None
+            return
+        self.min_level = int(np.floor(np.log2(cells.min())))
+        self.max_level = int(np.floor(np.log2(cells.max())))
+        index_dtype = np.int32 if self.size < 2**31 else np.int64
+        for k in range(self.min_level, self.max_level + 1):
+            ids = np.floor(points / 2.0**k).astype(np.int64)
+            change = (ids[1:] != ids[:-1]).any(axis=1)
+            runs = np.flatnonzero(np.insert(change, 0, True) | np.append(change, True))
+            self.levels[k] = (_next_in_cell(ids).astype(index_dtype), runs.astype(index_dtype))
+
+    def level(self, cell):
+        """Pyramid level for a cell size, or None when full resolution is needed."""
+        if self.min_level is None or not np.isfinite(cell) or cell < 2.0**self.min_level:
+            return None
+        return min(int(np.floor(np.log2(cell))), self.max_level)
+
+    def indices(self, stop, cell, lines=False):
+        """
+        Points to draw among ``0..stop-1`` with cells of at most ``cell``.
+
+        Returns
+        -------
+        index : slice or ndarray
+            ``slice(0, stop)`` at full resolution (so arrays are sliced as
+            views), otherwise the sorted kept indices. The last point
+            ``stop-1`` is always included.
+        """
+        k = self.level(cell)
+        if k is None or stop <= 0:
+            return slice(0, max(stop, 0))
+        if not lines:
+            return np.flatnonzero(self.levels[k][0][:stop] >= stop)
+        runs = self.levels[k][1]
+        return np.append(runs[:np.searchsorted(runs, stop - 1)], stop - 1)
+
+    def count(self, stop, cell, lines=False):
+        """Number of points ``indices`` returns."""
+        index = self.indices(stop, cell, lines)
+        return index.stop if isinstance(index, slice) else len(index)
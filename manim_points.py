@@ -0,0 +1,116 @@
+from manim import *
+import numpy as np
+import matplotlib.pyplot as plt
+
+# -----------------------------------------------------------
+# Bulk point clouds for complex arrays.
+# Replaces the notebooks' plot_complex_points (one Dot and one hex color
+# string per sample) with a single PMobject whose points and RGBA colors are
+# NumPy arrays, plus a fade-in animation that updates them all at once.
+# Written for the default Cairo renderer, which draws each point of a
+# PMobject as a square of stroke_width pixels: the cloud looks like the old
+# round Dots only while they are a few pixels wide, and larger points show as
+# squares. FadeInPoints' fade stands in for Write's lag_ratio only
+# approximately. dots=True keeps the notebooks' original rendering (one Dot
+# per sample, animated with Write and its lag_ratio, see fade_in) for scenes
+# where that matters.
+# -----------------------------------------------------------
+
+def normalized_angles(complex_array):
+    # Angles of the samples scaled to [0, 1], the colormap input used by the
+    # notebooks' scenes.
+    angles = np.angle(complex_array)
+    span = np.max(angles) - np.min(angles)
+    return (angles - np.min(angles)) / span if span > 0 else np.zeros(len(angles))
+
+def point_colors(values, cmap="hsv", opacity=1.0, background=BLACK):
+    # (N, 4) RGBA of values in [0, 1] in one colormap call. The Cairo point
+    # cloud writes pixels without blending, so opacity is applied by mixing
+    # with the background color (like a Dot with fill_opacity on it).
+    rgbas = plt.get_cmap(cmap)(np.asarray(values, dtype=float))
+    rgbas[:, :3] = opacity * rgbas[:, :3] + (1 - opacity) * color_to_rgb(background)
+    rgbas[:, 3] = 1.0
+    return rgbas
+
+def dot_stroke_width(radius=DEFAULT_DOT_RADIUS):
+    # Pixel size of a point matching the diameter of a Dot of this radius.
+    return max(1, int(round(2 * radius * config.pixel_width / config.frame_width)))
+
+def complex_to_points(complex_array):
+    complex_array = np.asarray(complex_array)
+    return np.column_stack((complex_array.real, complex_array.imag, np.zeros(len(complex_array))))
+
+def plot_complex_dots(complex_array, values, cmap="hsv", opacity=1.0, radius=DEFAULT_DOT_RADIUS):
+    # The notebooks' original VGroup of one Dot per sample, with the same
+    # 8-bit hex colors and fill_opacity.
+    dots = VGroup()
+    for complex_point, rgba in zip(complex_array, plt.get_cmap(cmap)(np.asarray(values, dtype=float))):
+        hex_color = "#" + "".join([f"{int(c * 255):02x}" for c in rgba[:3]])
+        dots.add(Dot(complex_to_R3(complex_point), radius=radius, color=hex_color, fill_opacity=opacity))
+    return dots
+
+def plot_complex_points(complex_array, values=None, cmap="hsv", opacity=1.0, radius=DEFAULT_DOT_RADIUS, dots=False):
+    # One PMobject with every sample of complex_array, colored through cmap by
+    # values (default: the normalized angles of the samples). dots=True
+    # returns the notebooks' VGroup of Dots instead.
+    if values is None:
+        values = normalized_angles(complex_array)
+    if dots:
+        return plot_complex_dots(complex_array, values, cmap, opacity, radius)
+    cloud = PMobject(stroke_width=dot_stroke_width(radius))
+    cloud.add_points(complex_to_points(complex_array), rgbas=point_colors(values, cmap, opacity))
+    return cloud
+
+class FadeInPoints(Animation):
+    # Fades the points of a PMobject in, in order. Point i starts at
+    # i/(N-1) * (1 - fade) of the run time and takes fade of it to reach its
+    # color, so fade=1 fades every point together and a small fade draws them
+    # one after another (like Write with a large lag_ratio); fade=0 shows each
+    # point at its color as soon as it starts. Each frame only slices and
+    # scales the original arrays.
+    def __init__(self, mobject, fade=0.1, background=BLACK, **kwargs):
+        if not 0 <= fade <= 1:
+            raise ValueError(f"fade must be between 0 and 1, got {fade}")
+        self.fade = fade
+        self.background = color_to_rgb(background)
+        super().__init__(mobject, **kwargs)
+
+    def begin(self):
+        self.target_points = self.mobject.points.copy()
+        self.target_rgbas = self.mobject.rgbas.copy()
+        n = len(self.target_points)
+        self.starts = np.linspace(0, 1 - self.fade, n) if n > 1 else np.zeros(n)
+        super().begin()
+
+    def interpolate_mobject(self, alpha):
+        # Points that have not started are left out entirely, so they do
+        # not cover what is underneath them.
+        visible = np.searchsorted(self.starts, alpha, side="right") if alpha > 0 else 0
+        rgbas = self.target_rgbas[:visible].copy()
+        if self.fade > 0:
+            progress = np.clip((alpha - self.starts[:visible]) / self.fade, 0, 1)[:, None]
+            rgbas[:, :3] = progress * rgbas[:, :3] + (1 - progress) * self.background
+        self.mobject.points = self.target_points[:visible]
+        self.mobject.rgbas = rgbas
+
+    def clean_up_from_scene(self, scene):
+        self.mobject.points = self.target_points
+        self.mobject.rgbas = self.target_rgbas
+        super().clean_up_from_scene(scene)
+
+def fade_in(mobject, fade=0.1, lag_ratio=None, **kwargs):
+    # FadeInPoints for a point cloud; for the Dots of dots=True, the
+    # notebooks' Write with lag_ratio (Write's default when None).
+    if isinstance(mobject, PMobject):
+        return FadeInPoints(mobject, fade=fade, **kwargs)
+    if lag_ratio is not None:
+        kwargs["lag_ratio"] = lag_ratio
+    return Write(mobject, **kwargs)
+
+def plot_dots_for_multiplot(scene, complex_arrays, run_time, fade=0.1, wait_after=0, lag_ratio=None, dots=False, **kwargs):
+    # Point-cloud version of myfunc.plot_dots_for_multiplot: one cloud per
+    # array, all faded in together (dots=True: the original Dots and Write).
+    clouds = [plot_complex_points(complex_array, dots=dots, **kwargs) for complex_array in complex_arrays]
+    scene.play(*[fade_in(cloud, fade, lag_ratio, run_time=run_time) for cloud in clouds])
+    scene.wait(wait_after)
+    return clouds
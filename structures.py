@@ -4,6 +4,8 @@ from matplotlib.animation import FuncAnimation, FFMpegWriter
 from mpl_toolkits.mplot3d.art3d import Line3DCollection
 from mpl_toolkits.mplot3d import Axes3D
 
+from atom import cached_carrier, transform_tensor, stack_carrier, apply_transforms
+
 # =============================================================================
 # Enforce a pure black background (dark style)
 # =============================================================================
@@ -24,36 +26,9 @@ plt.rcParams.update({
     "savefig.edgecolor": "black"
 })
 
-# =============================================================================
-# Compute the Carrier using the Toy-Universe Formulas
-# =============================================================================
-def compute_carrier(N, D=4):
-    r_phi = 0.5 + np.sqrt(D+1)/2
-    r_o = 1.0 / D
-    r_eta = 0.5 + 1j * np.sqrt(D-1)/2  
-    t_o = D + 3 + 3 + 3
-    T_o = 4 * np.pi * (1 + np.sqrt(D+1))
-    Omega = 2 * np.pi / T_o
-    n_array = np.arange(N)
-    phi = ((n_array+1)/r_o) * np.exp(1j * Omega*(n_array+1))
-    eta = (n_array+1) * r_eta
-    tau = r_o * r_eta * np.exp(-1j * Omega*(n_array+1))
-    alpha = (r_o+t_o - ((n_array+1)/(2*r_o))) * np.real(tau)
-    beta  = (r_o+t_o - ((np.sqrt(D-1)*(n_array+1))/2)) * np.imag(tau)
-    gamma = alpha + 1j*beta
-    u = np.real(gamma)
-    v = np.imag(gamma)
-    w = np.log2(np.abs(gamma) + 1e-9)
-    return n_array, u, v, w, gamma, alpha, beta
-
 # =============================================================================
 # Helper Functions for Coloring and Plotting
 # =============================================================================
-def get_colors(n_array, M_c, cmap_name='hsv'):
-    indices = n_array % M_c
-    cmap = plt.get_cmap(cmap_name, M_c)
-    return [cmap(i) for i in indices]
-
 def remove_axes(ax):
     ax.set_xticks([])
     ax.set_yticks([])
@@ -101,11 +76,18 @@ def filter_transforms(flower_index=None, wormhole_index=None):
 # =============================================================================
 # Plot and Animate Functions
 # =============================================================================
+def transform_curves(u, v, w, flower_index=None, wormhole_index=None):
+    # One matmul over the selected signed-permutation matrices instead of a
+    # Python call per lambda; curves[k] holds the (N, 3) points of transform k.
+    selected = filter_transforms(flower_index, wormhole_index)
+    if not selected:
+        return np.empty((0, len(u), 3))
+    return apply_transforms(stack_carrier(u, v, w), transform_tensor(selected)[0])
+
 def plot_atom(n_array, u, v, w, gamma, M_c, flower_index=None, wormhole_index=None):
     fig = plt.figure(figsize=(10, 10))
     ax = fig.add_subplot(111, projection='3d')
-    for t in filter_transforms(flower_index, wormhole_index):
-        x, y, z = t["func"](u, v, w)
+    for x, y, z in np.moveaxis(transform_curves(u, v, w, flower_index, wormhole_index), 2, 1):
         ax.plot(x, y, z, alpha=0.7)
     remove_axes(ax)
     plt.show()
@@ -113,12 +95,12 @@ def plot_atom(n_array, u, v, w, gamma, M_c, flower_index=None, wormhole_index=No
 def animate_atom(n_array, u, v, w, gamma, M_c, flower_index=None, wormhole_index=None, interval=100):
     fig = plt.figure(figsize=(10, 10))
     ax = fig.add_subplot(111, projection='3d')
-    curves = [t["func"](u, v, w) for t in filter_transforms(flower_index, wormhole_index)]
+    curves = transform_curves(u, v, w, flower_index, wormhole_index)
 
     def update(frame):
         ax.clear()
-        for x, y, z in curves:
-            ax.plot(x[:frame], y[:frame], z[:frame], alpha=0.7)
+        for x, y, z in np.moveaxis(curves[:, :frame], 2, 1):
+            ax.plot(x, y, z, alpha=0.7)
         remove_axes(ax)
     
     ani = FuncAnimation(fig, update, frames=len(n_array), interval=interval, repeat=False)
@@ -130,7 +112,7 @@ def animate_atom(n_array, u, v, w, gamma, M_c, flower_index=None, wormhole_index
 N = 1000
 D = 4
 M_c = 13
-n_array, u, v, w, gamma, alpha, beta = compute_carrier(N, D)
+n_array, u, v, w, gamma, alpha, beta = cached_carrier(N, D)
 
 # Plot full atom
 plot_atom(n_array, u, v, w, gamma, M_c)
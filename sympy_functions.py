@@ -0,0 +1,190 @@
+import hashlib
+import importlib
+import inspect
+import json
+import os
+import types
+from collections import OrderedDict
+
+import numpy as np
+from sympy import latex, srepr
+from sympy.utilities.lambdify import lambdify
+
+# =============================================================================
+# Cached SymPy -> NumPy Compilation
+# =============================================================================
+# lambdify prints the expression to Python source and compiles it on every
+# call, which dominates the startup of formula-driven scenes that rebuild the
+# same expressions each time a cell re-runs. Compiled functions are cached
+# here by the canonical ``srepr`` of the variables and the expression (plus
+# the backend), in memory with LRU eviction and optionally on disk as the
+# generated source, so a new session only has to exec it. The extra globals
+# lambdify imports for an expression are saved with its source and imported
+# again on load.
+
+_NAMESPACES = {}
+
+def _namespace(backend):
+    # Globals lambdify gives its functions for this backend (numpy names,
+    # numexpr's evaluate, ...), taken from a trivial compiled function.
+    if backend not in _NAMESPACES:
+        _NAMESPACES[backend] = dict(lambdify([], 0, modules=backend).__globals__)
+    return _NAMESPACES[backend]
+
+def _code_names(code):
+    # Global names used by a code object and the code objects nested in it.
+    names = set(code.co_names)
+    for const in code.co_consts:
+        if isinstance(const, types.CodeType):
+            names |= _code_names(const)
+    return names
+
+def _global_imports(func, backend):
+    # How to rebuild the globals a lambdified function uses beyond the base
+    # namespace of its backend (lambdify adds e.g. numpy's select and nan for
+    # a Piecewise): {name: ["import", module, attribute]} or
+    # {name: ["float" | "int" | "complex", repr]}. None if one cannot be
+    # rebuilt, in which case the function is not stored on disk.
+    base = _namespace(backend)
+    imports = {}
+    for name in sorted(_code_names(func.__code__)):
+        if name not in func.__globals__ or base.get(name, imports) is func.__globals__[name]:
+            continue
+        value = func.__globals__[name]
+        if type(value) in (int, float, complex):
+            imports[name] = [type(value).__name__, repr(value)]
+            continue
+        module, attribute = getattr(value, '__module__', None), getattr(value, '__name__', None)
+        try:
+            found = getattr(importlib.import_module(module), attribute, None) if module and attribute else None
+        except ImportError:
+            found = None
+        if found is not value:
+            return None
+        imports[name] = ['import', module, attribute]
+    return imports
+
+def _rebuild_imports(imports):
+    values = {}
+    for name, (kind, *spec) in imports.items():
+        if kind == 'import':
+            values[name] = getattr(importlib.import_module(spec[0]), spec[1])
+        else:
+            values[name] = {'int': int, 'float': float, 'complex': complex}[kind](spec[0])
+    return values
+
+def _as_tuple(variable):
+    return tuple(variable) if isinstance(variable, (list, tuple)) else (variable,)
+
+class LambdifyCache:
+    """
+    LRU cache of lambdified functions and LaTeX strings keyed by ``srepr``.
+
+    Parameters
+    ----------
+    maxsize : int
+        Number of compiled functions (and, separately, LaTeX strings) kept
+        in memory.
+    cache_dir : str, optional
+        Directory where the generated source of every compiled function is
+        stored and looked up before compiling. Files are executed when
+        loaded, so only point this at a directory you trust.
+    """
+
+    def __init__(self, maxsize=256, cache_dir=None):
+        self.maxsize = maxsize
+        self.cache_dir = cache_dir
+        self._functions = OrderedDict()
+        self._tex = OrderedDict()
+
+    def clear(self):
+        self._functions.clear()
+        self._tex.clear()
+
+    def get(self, variable, expresion, backend='numpy', cse=False):
+        key = f"{backend}|cse={cse}|{srepr(_as_tuple(variable))}|{srepr(expresion)}"
+        func = self._functions.get(key)
+        if func is None:
+            func = self._load(key, backend)
+            if func is None:
+                func = lambdify(variable, expresion, modules=[backend], cse=cse)
+                self._store(key, func, backend)
+            self._functions[key] = func
+            while len(self._functions) > self.maxsize:
+                self._functions.popitem(last=False)
+        self._functions.move_to_end(key)
+        return func
+
+    def latex(self, expresion):
+        key = srepr(expresion)
+        tex = self._tex.get(key)
+        if tex is None:
+            tex = self._tex[key] = latex(expresion)
+            while len(self._tex) > self.maxsize:
+                self._tex.popitem(last=False)
+        self._tex.move_to_end(key)
+        return tex
+
+    def _source_path(self, key):
+        return os.path.join(self.cache_dir, hashlib.sha256(key.encode()).hexdigest() + ".py")
+
+    def _load(self, key, backend):
+        if self.cache_dir is None:
+            return None
+        path = self._source_path(key)
+        if not os.path.exists(path):
+            return None
+        with open(path) as f:
+            source = f.read()
+        namespace = dict(_namespace(backend))
+        # Second line: "# imports: {...}" (absent in files of older versions).
+        lines = source.split("\n", 2)
+        if len(lines) > 1 and lines[1].startswith("# imports: "):
+            namespace.update(_rebuild_imports(json.loads(lines[1][len("# imports: "):])))
+        exec(compile(source, path, "exec"), namespace)
+        return namespace["_lambdifygenerated"]
+
+    def _store(self, key, func, backend):
+        if self.cache_dir is None:
+            return
+        imports = _global_imports(func, backend)
+        if imports is None:
+            return
+        os.makedirs(self.cache_dir, exist_ok=True)
+        path = self._source_path(key)
+        # Write then rename, so concurrent sessions never read a partial file.
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "w") as f:
+            f.write(f"# {key}\n# imports: {json.dumps(imports)}\n" + inspect.getsource(func))
+        os.replace(tmp, path)
+
+npf_cache = LambdifyCache()
+
+def get_npf(variable, expresion, backend='numpy', cse=False):
+    """
+    NumPy function of a SymPy expression, compiled once per expression.
+
+    Parameters
+    ----------
+    variable : Symbol or sequence of Symbol
+        Arguments of the returned function.
+    expresion : sympy.Expr
+        Expression to compile.
+    backend : str
+        lambdify module: 'numpy', or 'numexpr' to evaluate the whole
+        expression in one fused, multi-threaded pass over large sample grids
+        (requires the optional numexpr package).
+    cse : bool
+        Factor out common subexpressions before compiling.
+    """
+    return npf_cache.get(variable, expresion, backend, cse)
+
+def get_tex_and_npf(expresion, variable, values=np.linspace(0, 2*np.pi, 360), backend='numpy'):
+    """
+    LaTeX string, cached NumPy function and its values on ``values``
+    (default: 0 to 2π in 360 steps).
+    """
+    tex = npf_cache.latex(expresion)
+    numpy_function = get_npf(variable, expresion, backend)
+    numpy_array = numpy_function(values)
+    return tex, numpy_function, numpy_array
@@ -0,0 +1,48 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from atlas_ingest import ingest_table
+from atlas_store import open_atlas
+from compass_functions import time_atlas
+
+
+def _table(n=50):
+    times = pd.date_range("2024-01-30", periods=n, freq="7h", name="time")
+    return pd.DataFrame({"a": np.arange(n, dtype=float), "b": -np.arange(n, dtype=float)}, index=times)
+
+
+def test_ingest_csv_time_index_with_value_columns(tmp_path):
+    table = _table()
+    source = tmp_path / "table.csv"
+    table.to_csv(source)
+    rows = ingest_table(str(source), str(tmp_path / "atlas"), value_columns=["b"], chunk_size=16, index_col=0)
+    assert rows == len(table)
+    arrays, _ = open_atlas(str(tmp_path / "atlas"))
+    assert np.array_equal(arrays["values"][:, 0], table["b"].to_numpy(np.float32))
+    assert np.allclose(arrays["atlas"], time_atlas(table.index, ("month", "day", "hour")))
+
+
+def test_ingest_parquet_time_index_with_value_columns(tmp_path):
+    pytest.importorskip("pyarrow")
+    table = _table()
+    source = tmp_path / "table.parquet"
+    table.to_parquet(source)
+    rows = ingest_table(str(source), str(tmp_path / "atlas"), value_columns=["a"], chunk_size=16)
+    assert rows == len(table)
+    arrays, _ = open_atlas(str(tmp_path / "atlas"))
+    assert np.allclose(arrays["atlas"], time_atlas(table.index, ("month", "day", "hour")))
+
+
+def test_ingest_without_time_index_raises(tmp_path):
+    source = tmp_path / "table.csv"
+    _table().to_csv(source, index=False)
+    with pytest.raises(ValueError, match="time_column"):
+        ingest_table(str(source), str(tmp_path / "atlas"), value_columns=["a"])
+
+
+def test_ingest_missing_timestamps_raise(tmp_path):
+    table = _table()
+    table.index = table.index.where(np.arange(len(table)) != 3)
+    with pytest.raises(ValueError, match="NaT"):
+        ingest_table([table], str(tmp_path / "atlas"))
@@ -0,0 +1,62 @@
+import numpy as np
+
+import pytest
+
+from atlas_raster import accumulate, pixel_index, raster_atlas, raster_carrier, raster_extent, rasterize
+from compass_functions import compass
+
+
+def test_zero_width_extent_is_widened():
+    xmin, xmax, ymin, ymax = raster_extent(np.array([2.0]), np.array([-3.0]))
+    assert xmin < 2.0 < xmax
+    assert ymin < -3.0 < ymax
+
+
+def test_pixel_index_zero_width_extent():
+    index, inside = pixel_index(np.array([1.0, 1.0]), np.array([0.0, 1.0]), (4, 4), (1.0, 1.0, 0.0, 1.0))
+    assert inside.all()
+    assert np.array_equal(index % 4, [0, 0])
+
+
+def test_rasterize_points_sharing_a_coordinate():
+    # All points on the real axis: the y range has zero width.
+    atlas = compass(np.arange(1, 5), 1, 0)
+    image, extent = raster_atlas(atlas, shape=(8, 8))
+    assert image.shape == (8, 8, 4)
+    assert extent[2] < 0 < extent[3]
+    assert (image[..., 3] > 0).sum() == 4
+
+    image, extent = rasterize(np.array([1.0]), np.array([1.0]), shape=(8, 8))
+    assert (image[..., 3] > 0).sum() == 1
+
+
+def test_raster_carrier_degenerate_projection():
+    image, extent = raster_carrier(100, 7, projection=np.zeros((3, 2)), shape=(8, 8), chunk_size=32)
+    assert extent[0] < 0 < extent[1]
+    assert (image[..., 3] > 0).sum() == 1
+
+
+@pytest.mark.parametrize("how", ["add", "mean", "max"])
+def test_accumulate_palette_matches_colors(how):
+    rng = np.random.default_rng(0)
+    x, y = rng.random((2, 500))
+    palette = rng.random((7, 4))
+    codes = rng.integers(0, 7, 500).astype(np.uint8)
+    expected = accumulate(x, y, (16, 16), (0, 1, 0, 1), palette[codes], how)
+    got = accumulate(x, y, (16, 16), (0, 1, 0, 1), codes, how, palette=palette)
+    assert np.array_equal(got[0], expected[0])
+    assert np.allclose(got[1], expected[1], rtol=1e-12, atol=0)
+
+
+@pytest.mark.parametrize("how", ["add", "max"])
+def test_raster_carrier_independent_of_chunk_size(how):
+    image, extent = raster_carrier(3000, 12, shape=(32, 32), how=how)
+    chunked, chunked_extent = raster_carrier(3000, 12, shape=(32, 32), how=how, chunk_size=48 * 100 + 7)
+    assert extent == chunked_extent
+    assert np.allclose(image, chunked, rtol=1e-12, atol=0)
+
+
+def test_raster_carrier_empty():
+    image, extent = raster_carrier(0, 12, shape=(8, 8))
+    assert np.isfinite(extent).all() and extent[0] < extent[1]
+    assert not image[..., 3].any()
@@ -0,0 +1,104 @@
+import numpy as np
+import pytest
+
+from atom import (COMPACT_DTYPES, CarrierCache, InstancedAtom, apply_transforms, atom_scene, cached_carrier,
+                  compute_carrier, iter_carrier, stack_carrier)
+from atlas_store import load_carrier, save_carrier
+
+
+@pytest.mark.parametrize("method", ['direct', 'recurrence'])
+@pytest.mark.parametrize("start, chunk_size", [(0, 1000), (3001, 777), (4096, 1024), (5000, 1)])
+def test_iter_carrier_matches_batch(method, start, chunk_size):
+    N = 6000 if chunk_size > 1 else 5200
+    batch = compute_carrier(N, method=method)
+    chunks = list(iter_carrier(N, start=start, chunk_size=chunk_size, method=method))
+    for streamed, expected in zip(zip(*chunks), batch):
+        np.testing.assert_array_equal(np.concatenate(streamed), expected[start:])
+
+
+
+def _assert_carrier_equal(got, N, method='direct'):
+    for a, b in zip(got, compute_carrier(N, method=method)):
+        np.testing.assert_array_equal(a, b)
+
+
+@pytest.mark.parametrize("method", ['direct', 'recurrence'])
+def test_carrier_cache_prefix_and_extension(method):
+    cache = CarrierCache()
+    _assert_carrier_equal(cache.get(0, method=method), 0, method)
+    _assert_carrier_equal(cache.get(5, method=method), 5, method)
+    _assert_carrier_equal(cache.get(3000, method=method), 3000, method)
+    full = cache.get(3000, method=method)
+    prefix = cache.get(1000, method=method)
+    _assert_carrier_equal(prefix, 1000, method)
+    # Shorter requests are read-only views of the cached arrays.
+    assert all(np.shares_memory(p, f) for p, f in zip(prefix, full))
+    assert not prefix[1].flags.writeable
+
+
+def test_carrier_cache_evicts_least_recently_used():
+    cache = CarrierCache()
+    cache.get(100, D=4)
+    cache.get(100, D=5)
+    cache.max_bytes = cache.nbytes
+    cache.get(100, D=4)
+    cache.get(100, D=6)
+    # D=5 was used least recently, so it makes room for D=6.
+    assert list(cache._entries) == [(4, 'direct', 1024), (6, 'direct', 1024)]
+    assert cache.nbytes <= cache.max_bytes
+
+
+def test_carrier_cache_skips_carriers_over_the_cap():
+    cache = CarrierCache(max_bytes=1)
+    _assert_carrier_equal(cache.get(10), 10)
+    assert cache.nbytes == 0
+
+
+def test_cached_carrier_matches_compute_carrier():
+    _assert_carrier_equal(cached_carrier(777), 777)
+
+
+@pytest.mark.parametrize("method", ['direct', 'recurrence'])
+def test_compact_carrier_within_float32_rounding(method):
+    full = compute_carrier(20000, method=method)
+    compact = compute_carrier(20000, method=method, compact=True)
+    assert compact[0].dtype == np.int32 and np.array_equal(compact[0], full[0])
+    for name, got, expected in zip(('u', 'v', 'w', 'gamma'), compact[1:5], full[1:5]):
+        assert got.dtype == COMPACT_DTYPES[name]
+        # One rounding of the float64 value: within 2^-24 of its magnitude.
+        for part in (np.real, np.imag) if name == 'gamma' else (np.real,):
+            err = np.abs(part(got).astype(np.float64) - part(expected))
+            assert np.all(err <= 2.0**-24 * np.abs(part(expected)))
+    streamed = list(iter_carrier(20000, chunk_size=3000, method=method, compact=True))
+    for chunks, expected in zip(zip(*streamed), compact[:5]):
+        assert np.array_equal(np.concatenate(chunks), expected)
+
+
+@pytest.mark.parametrize("compact", [False, True])
+def test_save_carrier_round_trip(tmp_path, compact):
+    save_carrier(str(tmp_path / "carrier"), 3000, chunk_size=700, compact=compact)
+    carrier, curves, meta = load_carrier(str(tmp_path / "carrier"))
+    expected = compute_carrier(3000, compact=compact)
+    assert meta["compact"] == compact and meta["N"] == 3000
+    for got, want in zip(carrier, expected):
+        assert got.dtype == want.dtype
+        assert np.array_equal(got, want)
+    assert np.array_equal(curves, apply_transforms(stack_carrier(*expected[1:4])))
+
+@pytest.mark.parametrize("lod", [False, True])
+def test_atom_scene_instanced_matches_stacked_curves(lod):
+    import matplotlib.pyplot as plt
+
+    n, u, v, w, gamma, _, _ = compute_carrier(200)
+    carrier = stack_carrier(u, v, w)
+    scenes = [atom_scene(n, u, v, w, gamma, 12, curves=curves, lod=lod)
+              for curves in (InstancedAtom(carrier), apply_transforms(carrier))]
+    for frame in (0, 1, 57, 200):
+        (fig_a, update_a), (fig_b, update_b) = scenes
+        for artist_a, artist_b in zip(update_a(frame), update_b(frame)):
+            if hasattr(artist_a, "_offsets3d"):
+                for a, b in zip(artist_a._offsets3d, artist_b._offsets3d):
+                    assert np.array_equal(a, b)
+            else:
+                assert np.array_equal(artist_a.get_data_3d(), artist_b.get_data_3d())
+    plt.close("all")
@@ -0,0 +1,23 @@
+import matplotlib.pyplot as plt
+import numpy as np
+import pytest
+
+from atom import InstancedAtom, compute_carrier, get_colors, stack_carrier
+from atom_camera import camera_scene, depth_order, orbit_angles, project
+
+
+@pytest.mark.parametrize("depth_sort", [True, False])
+def test_camera_scene_colors_follow_their_curve_points(depth_sort):
+    n, u, v, w, gamma, _, _ = compute_carrier(50)
+    phis, thetas = orbit_angles(2)
+    fig, update = camera_scene(n, u, v, w, gamma, 12, phis, thetas, plot_mode='both', depth_sort=depth_sort)
+    scatter, lines = update(1)
+    colors = get_colors(n, 12, cmap_name='hsv')
+    _, depth = project(InstancedAtom(stack_carrier(u, v, w)), phis[1], thetas[1])
+    expected = np.tile(colors, (len(depth), 1))
+    if depth_sort:
+        expected = expected[depth_order(depth)]
+    facecolors = scatter.get_facecolors()
+    assert np.array_equal(np.resize(facecolors, expected.shape), expected)
+    assert len(lines.get_segments()) == len(depth) * (len(n) - 1)
+    plt.close(fig)
@@ -0,0 +1,108 @@
+import os
+
+import matplotlib.pyplot as plt
+import numpy as np
+import pandas as pd
+import pytest
+
+from colormap_tables import colormap_lut
+from compass_functions import (atlas_video_scene, atlas_view, compact_atlas, compass, get_colors, lut_colors,
+                               non_overlapping, plot_atlas, plot_compact_atlas, time_atlas, time_parts)
+
+
+@pytest.mark.parametrize("values", [np.arange(-2, 12), np.array([0.0, 0.25, 0.5, 1.0, 1.5]), 7])
+def test_lut_colors_match_colormap_call(values):
+    cmap = plt.get_cmap("viridis").resampled(5)
+    assert np.array_equal(lut_colors("viridis", 5, values), cmap(values))
+
+
+def test_colormap_lut_accepts_names_and_colormaps():
+    assert colormap_lut("hsv", 6) is colormap_lut("hsv", 6)
+    assert np.array_equal(colormap_lut(plt.get_cmap("hsv"), 6), colormap_lut("hsv", 6))
+
+
+def test_colormap_lut_keeps_colormaps_sharing_a_name_apart():
+    from matplotlib.colors import ListedColormap
+
+    red, blue = ListedColormap(["red"]), ListedColormap(["blue"])
+    assert red.name == blue.name
+    assert np.array_equal(colormap_lut(red, 2)[:, :3], [[1, 0, 0]] * 2)
+    assert np.array_equal(colormap_lut(blue, 2)[:, :3], [[0, 0, 1]] * 2)
+    over = plt.get_cmap("viridis").with_extremes(over="red")
+    assert np.array_equal(colormap_lut(over, 4), colormap_lut("viridis", 4))
+
+
+def test_atlas_view_char_colors_beyond_table():
+    s = np.arange(12)
+    atlas = compass(s, 1, 12)
+    plt.figure()
+    # T_symbol > T_char, and float symbol colors
+    atlas_view(s, 12, atlas[3], 10, 'o', s[3] / 12, 'hsv', 12, True, 4, s[3] + 8, 8, 'viridis')
+    plt.close("all")
+
+
+def test_atlas_video_scene_keeps_the_most_recent_labels():
+    s = np.arange(1, 30)
+    atlas = compass(s, 1, 7)
+    offsets = np.column_stack((atlas.real, atlas.imag))
+    fig, update = atlas_video_scene(atlas, s, plt.get_cmap("viridis"), False, 10, 0.1, 3, 3,
+                                    text_size=8, max_labels=5)
+    labels = fig.axes[0].collections[-1]
+    for frame, shown in [(0, 1), (3, 4), (20, 5)]:
+        update(frame)
+        assert np.array_equal(labels.get_offsets(), offsets[frame + 1 - shown:frame + 1])
+    plt.close(fig)
+
+
+def test_time_parts_reject_missing_timestamps():
+    index = pd.DatetimeIndex(["2024-02-29 13:00", None, "2024-03-01"])
+    with pytest.raises(ValueError, match="NaT"):
+        time_parts(index)
+    with pytest.raises(ValueError, match="NaT"):
+        time_atlas(index, ("month", "day", "hour"))
+
+
+@pytest.mark.parametrize("points, sizes, expected", [
+    # Far apart: both kept, whatever their sizes.
+    ([[100, 100], [200, 200]], [10, 20], [True, True]),
+    # Overlapping labels of different sizes: the later one is dropped.
+    ([[100, 100], [104, 104]], [10, 12], [True, False]),
+    ([[0, 0], [5, 5], [30, 0]], 10, [True, False, True]),
+])
+def test_non_overlapping_bins_labels_on_one_grid(points, sizes, expected):
+    assert np.array_equal(non_overlapping(np.array(points, dtype=float), np.asarray(sizes)), expected)
+
+
+def test_plot_atlas_one_scatter_per_marker():
+    s = np.arange(-5, 9)
+    plot_atlas(compass(s, 1, 14), s, plt.cm.hsv, 0.5, 3, 3, True, 2)
+    collections = plt.gca().collections
+    assert sorted(len(c.get_offsets()) for c in collections) == [5, 9]
+    plt.close("all")
+
+
+def test_compass_import_keeps_atom_style():
+    # compass_functions must not import atom (and its dark style) as a side effect.
+    import subprocess
+    import sys
+
+    code = ("import matplotlib; matplotlib.use('Agg'); import matplotlib.pyplot as plt; "
+            "before = dict(plt.rcParams); import compass_functions, sys; "
+            "assert 'atom' not in sys.modules; assert dict(plt.rcParams) == before; "
+            "import atom; assert plt.rcParams['figure.facecolor'] == 'black'")
+    subprocess.run([sys.executable, "-c", code], check=True, cwd=os.path.dirname(os.path.dirname(__file__)))
+
+
+@pytest.mark.parametrize("symbol", [np.arange(-20, 200), np.linspace(-1, 1, 50)])
+def test_compact_atlas_within_documented_precision(symbol):
+    atlas = compass(np.abs(symbol) + 1, 7, symbol)
+    points = compact_atlas(atlas, symbol, plt.cm.hsv, True, 3)
+    assert points.dtype.itemsize == (18 if symbol.dtype.kind == "i" else 20)
+    _, _, colors, _, sizes = get_colors(symbol, plt.cm.hsv, True, 3)
+    assert np.all(np.abs(points["z"] - atlas) <= 2.0**-23 * np.abs(atlas))
+    assert np.abs(points["rgba"] / 255 - colors).max() <= 1 / 510 + 1e-12
+    assert np.array_equal(points["size"], sizes.astype(np.float32))
+    assert np.array_equal(points["symbol"], symbol.astype(points["symbol"].dtype))
+    plot_compact_atlas(points, 0.5, 3, 3)
+    assert sum(len(c.get_offsets()) for c in plt.gca().collections) == len(symbol)
+    plt.close("all")
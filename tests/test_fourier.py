@@ -0,0 +1,101 @@
+import matplotlib.pyplot as plt
+import numpy as np
+import pytest
+
+from fourier import (add_partial_terms, epicycle_chain, epicycle_frequencies, fft_period, fourier_coefficients,
+                     fourier_convergence_scene, fourier_series, iter_partial_sums, sort_epicycles)
+
+
+def _direct_coefficients(x, t, dt, Tp, N):
+    # The notebooks' definition: c_n = (1/Tp) trapz(x exp(-2πi n t/Tp)).
+    n = np.arange(-N, N)
+    integrand = x * np.exp(-2j * np.pi * np.outer(n, t) / Tp)
+    if dt is None:
+        return np.trapezoid(integrand, t, axis=1) / Tp
+    return np.trapezoid(integrand, dx=dt, axis=1) / Tp
+
+
+def _signal(t, Tp):
+    return np.sign(np.sin(2 * np.pi * t / Tp)) + 0.5j * np.cos(6 * np.pi * t / Tp)
+
+
+@pytest.mark.parametrize("M, N", [(361, 20), (101, 70)])
+def test_fft_coefficients_match_direct_sum(M, N):
+    Tp = 2.0
+    t = np.linspace(-Tp / 2, Tp / 2, M)
+    assert fft_period(t, Tp) == M - 1
+    x = _signal(t, Tp)
+    c = fourier_coefficients(x, t, t[1] - t[0], Tp, N)
+    np.testing.assert_allclose(c, _direct_coefficients(x, t, t[1] - t[0], Tp, N), rtol=0, atol=1e-12)
+    expected = _direct_coefficients(x, t, t[1] - t[0], Tp, N) @ np.exp(2j * np.pi * np.outer(np.arange(-N, N), t) / Tp)
+    np.testing.assert_allclose(fourier_series(c, t, Tp), expected, rtol=0, atol=1e-10)
+
+
+def test_nonuniform_coefficients_match_direct_sum():
+    Tp = 3.0
+    t = np.sort(np.random.default_rng(1).uniform(0, Tp, 400))
+    assert fft_period(t, Tp) is None
+    x = _signal(t, Tp)
+    c = fourier_coefficients(x, t, None, Tp, 30, chunk_size=7)
+    np.testing.assert_allclose(c, _direct_coefficients(x, t, None, Tp, 30), rtol=0, atol=1e-12)
+
+
+def test_fft_period():
+    assert fft_period(np.linspace(0, 1, 11), 2.0) == 20
+    assert fft_period(np.linspace(0, 1, 11), 0.33) is None
+    assert fft_period(np.array([0.0, 0.1, 0.3]), 1.0) is None
+    assert fft_period(np.array([0.0]), 1.0) is None
+
+
+def _partial_sum(c, t, Tp, K):
+    N = len(c) // 2
+    return fourier_series(c[N - K:N + K], t, Tp)
+
+
+def test_partial_sums_match_fourier_series():
+    Tp = 2.0
+    t = np.linspace(-Tp / 2, Tp / 2, 201)
+    c = fourier_coefficients(_signal(t, Tp), t, t[1] - t[0], Tp, 25)
+    steps = list(iter_partial_sums(c, t, Tp))
+    assert [K for K, _ in steps] == list(range(1, 26))
+    for K, S in iter_partial_sums(c, t, Tp):
+        np.testing.assert_allclose(S, _partial_sum(c, t, Tp, K), rtol=0, atol=1e-10)
+    for K, S in iter_partial_sums(c, t, Tp, terms=[2, 2, 9, 25]):
+        np.testing.assert_allclose(S, _partial_sum(c, t, Tp, K), rtol=0, atol=1e-10)
+    with pytest.raises(ValueError):
+        list(iter_partial_sums(c, t, Tp, terms=[3, 2]))
+    out = _partial_sum(c, t, Tp, 4)
+    np.testing.assert_allclose(add_partial_terms(out, c, t, Tp, 4, 11), _partial_sum(c, t, Tp, 11), rtol=0, atol=1e-10)
+
+
+def test_convergence_scene_frames_any_order():
+    Tp = 2.0
+    t = np.linspace(-Tp / 2, Tp / 2, 101)
+    x = _signal(t, Tp)
+    terms = [1, 3, 8, 20]
+    c = fourier_coefficients(x, t, t[1] - t[0], Tp, max(terms))
+    fig, update = fourier_convergence_scene(x, t, t[1] - t[0], Tp, terms, figsize=(2, 1))
+    # Forward steps, then backward jumps below the current K.
+    for frame in [0, 1, 2, 3, 1, 0, 3, 2]:
+        line, _ = update(frame)
+        np.testing.assert_allclose(line.get_ydata(), _partial_sum(c, t, Tp, terms[frame]).real, rtol=0, atol=1e-10)
+    plt.close(fig)
+
+
+@pytest.mark.parametrize("sort", [False, True])
+def test_epicycle_tip_is_the_partial_sum(sort):
+    Tp = 2.0
+    t = np.linspace(-Tp / 2, Tp / 2, 151)
+    c = fourier_coefficients(_signal(t, Tp), t, t[1] - t[0], Tp, 12)
+    centers = epicycle_chain(c, t, omega=2 * np.pi / Tp, sort=sort)
+    assert centers.shape == (len(t), len(c))
+    np.testing.assert_allclose(centers[:, -1], fourier_series(c, t, Tp), rtol=0, atol=1e-10)
+    chunked = epicycle_chain(c, t, omega=2 * np.pi / Tp, sort=sort, chunk_size=7)
+    assert np.array_equal(chunked, centers)
+
+
+def test_sort_epicycles_by_magnitude():
+    c = np.array([1, -3j, 2, 3, 0.5])
+    sorted_c, frequencies = sort_epicycles(c)
+    assert np.array_equal(sorted_c, [-3j, 3, 2, 1, 0.5])
+    assert np.array_equal(frequencies, epicycle_frequencies(5)[[1, 3, 2, 0, 4]])
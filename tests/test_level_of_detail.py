@@ -0,0 +1,61 @@
+import numpy as np
+import pytest
+
+from level_of_detail import DetailPyramid, pixel_cells
+
+
+def _walk(n=5000, seed=0):
+    return np.cumsum(np.random.default_rng(seed).normal(size=(n, 2)), axis=0)
+
+
+def test_pixel_cells_follow_the_view():
+    limits = np.array([[[0, 100], [0, 50]], [[0, 200], [0, 400]]], dtype=float)
+    np.testing.assert_allclose(pixel_cells(limits, 100), [0.25, 1.0])
+    np.testing.assert_allclose(pixel_cells(limits, 100, pixels=1), [0.5, 2.0])
+
+
+@pytest.mark.parametrize("stop", [1, 700, 5000])
+def test_scatter_levels_keep_one_point_per_cell(stop):
+    points = _walk()
+    pyramid = DetailPyramid(points, [0.5, 8.0])
+    for k in range(pyramid.min_level, pyramid.max_level + 1):
+        kept = pyramid.indices(stop, 2.0**k)
+        ids = np.floor(points[:stop] / 2.0**k).astype(np.int64)
+        # One point per occupied cell: the last one drawn in it.
+        assert len(kept) == len(np.unique(ids, axis=0))
+        assert len(np.unique(ids[kept], axis=0)) == len(kept)
+        assert kept[-1] == stop - 1
+        last = {tuple(cell): i for i, cell in enumerate(ids)}
+        assert sorted(last.values()) == kept.tolist()
+
+
+def test_line_levels_keep_the_ends_of_every_run():
+    points = _walk()
+    pyramid = DetailPyramid(points, [1.0, 4.0])
+    for cell in (1.0, 2.0, 4.0):
+        kept = pyramid.indices(3000, cell, lines=True)
+        ids = np.floor(points[:3000] / cell).astype(np.int64)
+        change = np.flatnonzero((ids[1:] != ids[:-1]).any(axis=1))
+        ends = np.union1d(np.union1d(change, change + 1), [0, 2999])
+        assert np.array_equal(kept, ends)
+        # Dropped points lie in the cell of the kept point before them.
+        before = kept[np.searchsorted(kept, np.arange(3000), side="right") - 1]
+        assert np.array_equal(ids, ids[before])
+
+
+def test_level_selection_follows_the_zoom():
+    pyramid = DetailPyramid(_walk(), [0.3, 5.0])
+    assert (pyramid.min_level, pyramid.max_level) == (-2, 2)
+    # Zoomed in past the finest level: full resolution, as a slice.
+    assert pyramid.level(0.2) is None
+    assert pyramid.indices(100, 0.2) == slice(0, 100)
+    assert [pyramid.level(c) for c in (0.25, 0.3, 1.0, 3.9, 4.0, 100.0)] == [-2, -2, 0, 1, 2, 2]
+    counts = [pyramid.count(5000, 2.0**k) for k in range(-2, 3)]
+    assert counts == sorted(counts, reverse=True) and counts[-1] < counts[0] < 5000
+    assert pyramid.level(np.nan) is None
+
+
+def test_empty_pyramid():
+    pyramid = DetailPyramid(np.zeros((0, 2)), [1.0])
+    assert pyramid.level(1.0) is None
+    assert pyramid.indices(0, 1.0) == slice(0, 0)
@@ -0,0 +1,34 @@
+import numpy as np
+import pytest
+
+manim = pytest.importorskip("manim")
+
+from manim_points import FadeInPoints, fade_in, plot_complex_points
+
+
+def test_cloud_and_dots_share_positions_and_colors():
+    z = np.exp(2j * np.pi * np.arange(12) / 12) * 2
+    cloud = plot_complex_points(z)
+    dots = plot_complex_points(z, dots=True)
+    assert len(dots) == len(z) == len(cloud.points)
+    np.testing.assert_allclose([dot.get_center() for dot in dots], cloud.points)
+    np.testing.assert_allclose([manim.color_to_rgb(dot.get_color()) for dot in dots], cloud.rgbas[:, :3], atol=1 / 255)
+    assert isinstance(fade_in(cloud), FadeInPoints)
+    assert isinstance(fade_in(dots, lag_ratio=0), manim.Write)
+
+
+@pytest.mark.parametrize("fade", [0, 0.3, 1])
+def test_fade_in_points_ends_on_the_target_colors(fade):
+    cloud = plot_complex_points(np.arange(5) + 1j)
+    target = cloud.rgbas.copy()
+    animation = FadeInPoints(cloud, fade=fade)
+    animation.begin()
+    animation.interpolate_mobject(1.0)
+    np.testing.assert_allclose(cloud.rgbas, target)
+    animation.interpolate_mobject(0.0)
+    assert len(cloud.points) == 0
+
+
+def test_fade_in_points_rejects_bad_fade():
+    with pytest.raises(ValueError):
+        FadeInPoints(plot_complex_points(np.arange(3) + 0j), fade=-0.1)
@@ -0,0 +1,30 @@
+import numpy as np
+import pytest
+import sympy as sp
+
+from sympy_functions import LambdifyCache
+
+x = sp.Symbol('x')
+
+
+@pytest.mark.parametrize("backend, expresion", [
+    ('numpy', sp.sin(x) ** 2 + sp.exp(-x)),
+    ('scipy', sp.Piecewise((sp.besselj(0, x), x < 1), (x ** 2, True))),
+])
+def test_disk_cache_round_trip(tmp_path, backend, expresion):
+    pytest.importorskip(backend)
+    values = np.linspace(0, 3, 7)
+    built = LambdifyCache(cache_dir=str(tmp_path)).get(x, expresion, backend)
+    assert len(list(tmp_path.iterdir())) == 1
+
+    loaded = LambdifyCache(cache_dir=str(tmp_path)).get(x, expresion, backend)
+    assert loaded is not built
+    np.testing.assert_array_equal(loaded(values), built(values))
+
+
+def test_memory_cache_reuses_functions():
+    cache = LambdifyCache(maxsize=1)
+    f = cache.get(x, sp.cos(x))
+    assert cache.get(x, sp.cos(x)) is f
+    cache.get(x, sp.sin(x))
+    assert cache.get(x, sp.cos(x)) is not f
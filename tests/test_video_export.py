@@ -0,0 +1,71 @@
+import stat
+from functools import partial
+
+import matplotlib as mpl
+import matplotlib.pyplot as plt
+import numpy as np
+import pytest
+
+from fourier import fourier_convergence_scene
+from video_export import iter_rendered_frames, save_scene
+
+
+@pytest.fixture
+def fake_ffmpeg(tmp_path, monkeypatch):
+    # Stands in for ffmpeg: copies the raw frames on stdin to the output file.
+    path = tmp_path / "ffmpeg"
+    path.write_text('#!/bin/sh\nfor out; do :; done\ncat > "$out"\n')
+    path.chmod(path.stat().st_mode | stat.S_IEXEC)
+    monkeypatch.setitem(mpl.rcParams, "animation.ffmpeg_path", str(path))
+    return path
+
+
+def _scene():
+    t = np.linspace(0, 1, 64, endpoint=False)
+    x = np.sign(np.sin(2 * np.pi * t)).astype(np.complex128)
+    return partial(fourier_convergence_scene, x, t, t[1], 1.0, [1, 2, 3], (2, 1))
+
+
+@pytest.mark.parametrize("workers, backend", [(None, "writer"), (1, "writer"), (2, "writer"), (None, "pipe")])
+def test_save_scene_writes_every_frame(fake_ffmpeg, tmp_path, workers, backend):
+    plt.close("all")
+    video = tmp_path / "out.mp4"
+    save_scene(_scene(), 3, str(video), fps=5, workers=workers, backend=backend)
+    assert video.stat().st_size > 0
+    if workers is not None or backend == "pipe":
+        # The parallel/pipe paths leave no figure open in this process.
+        assert plt.get_fignums() == []
+    plt.close("all")
+
+
+def _frames(workers, renderer):
+    rendered = iter_rendered_frames(_scene(), range(3), workers=workers, renderer=renderer)
+    frame_size = next(rendered)
+    return frame_size, [bytes(frame) for frame in rendered]
+
+
+@pytest.mark.parametrize("renderer", ["savefig", "agg"])
+def test_parallel_frames_match_serial(renderer):
+    size, serial = _frames(1, renderer)
+    parallel_size, parallel = _frames(2, renderer)
+    assert parallel_size == size
+    assert len(serial) == 3 and len(set(serial)) == 3
+    assert parallel == serial
+    assert len(serial[0]) == size[0] * size[1] * 4
+
+
+def test_parallel_video_matches_serial_writer(fake_ffmpeg, tmp_path):
+    serial, parallel = tmp_path / "serial.raw", tmp_path / "parallel.raw"
+    save_scene(_scene(), 3, str(serial), fps=5)
+    save_scene(_scene(), 3, str(parallel), fps=5, workers=2)
+    assert parallel.read_bytes() == serial.read_bytes()
+    plt.close("all")
+
+
+@pytest.mark.parametrize("workers", [None, 2])
+def test_pipe_backend_matches_writer(fake_ffmpeg, tmp_path, workers):
+    writer, pipe = tmp_path / "writer.raw", tmp_path / "pipe.raw"
+    save_scene(_scene(), 3, str(writer), fps=5)
+    save_scene(_scene(), 3, str(pipe), fps=5, workers=workers, backend="pipe")
+    assert pipe.read_bytes() == writer.read_bytes()
+    plt.close("all")
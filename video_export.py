@@ -0,0 +1,275 @@
+import io
+import multiprocessing
+import os
+import subprocess
+import time
+
+import matplotlib as mpl
+import matplotlib.pyplot as plt
+from matplotlib.animation import FuncAnimation, FFMpegWriter, adjusted_figsize
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+# =============================================================================
+# Parallel Frame Rendering for Atlas Videos
+# =============================================================================
+# A "scene" is a picklable callable (a module-level function, usually wrapped
+# in functools.partial) returning ``(fig, update)``, where ``update(frame)``
+# brings the figure to the state of that frame regardless of which frames were
+# drawn before it. Every worker process builds its own copy of the scene and
+# renders a contiguous block of frames; the parent streams the frames, in
+# order, into a single ffmpeg pipe.
+#
+# Two frame renderers are available:
+#
+# - 'savefig' rasterizes exactly like matplotlib's FFMpegWriter
+#   (``savefig(format='rgba')`` into an ffmpeg rawvideo pipe with the same
+#   arguments), so the video is identical to the FuncAnimation.save path.
+# - 'agg' draws the Agg canvas and writes its ``buffer_rgba()`` straight into
+#   the pipe. It skips savefig's per-frame figure serialization (renderer
+#   setup, facecolor swaps, bbox handling) and reuses the canvas' frame
+#   buffer, at the price of using the figure facecolor instead of
+#   ``rcParams['savefig.facecolor']``.
+
+def ffmpeg_command(output_path, frame_size, fps, codec=None, crf=None, extra_args=()):
+    """
+    The ffmpeg command line for a rawvideo RGBA pipe, as used by FFMpegWriter.
+
+    Parameters
+    ----------
+    output_path : str
+        Video file to write.
+    frame_size : (int, int)
+        Width and height of each frame in pixels.
+    fps : float
+        Frames per second.
+    codec : str, optional
+        Output codec (default ``rcParams['animation.codec']``).
+    crf : int, optional
+        Constant rate factor for codecs that support it (e.g. h264: 0 is
+        lossless, 23 is ffmpeg's default).
+    extra_args : sequence of str
+        Extra output arguments, placed before the output file.
+    """
+    codec = codec or mpl.rcParams['animation.codec']
+    args = [mpl.rcParams['animation.ffmpeg_path'], '-f', 'rawvideo', '-vcodec', 'rawvideo',
+            '-s', '%dx%d' % frame_size, '-pix_fmt', 'rgba', '-framerate', str(fps),
+            '-loglevel', 'error', '-i', 'pipe:', '-vcodec', codec]
+    if codec in ('h264', 'libx264') and '-pix_fmt' not in extra_args:
+        args += ['-pix_fmt', 'yuv420p']
+    if crf is not None:
+        args += ['-crf', str(crf)]
+    return args + list(extra_args) + ['-y', output_path]
+
+def _prepare_figure(fig, dpi, codec):
+    # Same frame-size adjustment as MovieWriter.setup: h264 needs even sizes.
+    w, h = fig.get_size_inches()
+    if codec in ('h264', 'libx264'):
+        w, h = adjusted_figsize(w, h, dpi, 2)
+        fig.set_size_inches(w, h, forward=True)
+    return int(w * dpi), int(h * dpi)
+
+_scene = {}
+
+def _init_worker(build_scene, dpi, codec, renderer):
+    mpl.use('Agg')
+    fig, update = build_scene()
+    _setup_scene(fig, update, dpi, codec, renderer)
+
+def _setup_scene(fig, update, dpi, codec, renderer):
+    dpi = dpi or fig.dpi
+    frame_size = _prepare_figure(fig, dpi, codec)
+    if renderer == 'agg':
+        fig.set_dpi(dpi)
+        canvas = fig.canvas if isinstance(fig.canvas, FigureCanvasAgg) else FigureCanvasAgg(fig)
+    elif renderer == 'savefig':
+        canvas = None
+    else:
+        raise ValueError(f"Unknown frame renderer: {renderer!r}")
+    _scene.update(fig=fig, update=update, dpi=dpi, size_inches=fig.get_size_inches(),
+                  frame_size=frame_size, canvas=canvas)
+
+def _draw_frame(frame):
+    # Returns the frame as a buffer; with the 'agg' renderer it is the
+    # canvas' own memory, valid until the next frame is drawn.
+    fig = _scene['fig']
+    _scene['update'](frame)
+    # Like MovieWriter.grab_frame, keep the figure at the setup size.
+    fig.set_size_inches(*_scene['size_inches'])
+    canvas = _scene['canvas']
+    if canvas is None:
+        buf = io.BytesIO()
+        fig.savefig(buf, format='rgba', dpi=_scene['dpi'])
+        return buf.getvalue()
+    canvas.draw()
+    buf = canvas.buffer_rgba()
+    if (buf.shape[1], buf.shape[0]) != _scene['frame_size']:
+        raise ValueError(f"Frame {frame} is {buf.shape[1]}x{buf.shape[0]} pixels, "
+                         f"expected {_scene['frame_size'][0]}x{_scene['frame_size'][1]}")
+    return buf
+
+def _render_frame(frame):
+    return bytes(_draw_frame(frame))
+
+def iter_rendered_frames(build_scene, frames, dpi=None, codec=None, workers=None,
+                         chunk_size=None, renderer='savefig'):
+    """
+    Render frames to raw RGBA buffers, in order, optionally on a process pool.
+
+    Parameters
+    ----------
+    build_scene : callable
+        Picklable ``build_scene() -> (fig, update)``, or an already built
+        ``(fig, update)`` pair when rendering serially.
+    frames : sequence of int
+        Frames to render.
+    dpi : float, optional
+        Rendering dpi (default: the figure dpi).
+    codec : str, optional
+        Target codec, used for the even-size adjustment of h264.
+    workers : int, optional
+        Number of processes; ``None`` uses every core and 1 renders serially
+        in the calling process.
+    chunk_size : int, optional
+        Contiguous frames handed to a worker at a time.
+    renderer : str
+        'savefig' or 'agg' (see module notes).
+
+    Yields
+    ------
+    frame_size : (int, int)
+        First item: the width and height of the frames in pixels.
+    frame : bytes or memoryview
+        Then one RGBA buffer per frame. In serial 'agg' mode this is the
+        canvas buffer itself, reused for every frame.
+    """
+    codec = codec or mpl.rcParams['animation.codec']
+    frames = list(frames)
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or not callable(build_scene):
+        fig, update = build_scene() if callable(build_scene) else build_scene
+        _setup_scene(fig, update, dpi, codec, renderer)
+        try:
+            yield _scene['frame_size']
+            for frame in frames:
+                yield _draw_frame(frame)
+        finally:
+            _scene.clear()
+            if callable(build_scene):
+                # The figure was built here for this video only.
+                plt.close(fig)
+        return
+    chunk_size = chunk_size or max(1, len(frames) // (4 * workers))
+    ctx = multiprocessing.get_context()
+    with ctx.Pool(workers, initializer=_init_worker, initargs=(build_scene, dpi, codec, renderer)) as pool:
+        # Size of the frames, from a throwaway copy of the scene in this process.
+        fig, _ = build_scene()
+        frame_size = _prepare_figure(fig, dpi or fig.dpi, codec)
+        plt.close(fig)
+        yield frame_size
+        yield from pool.imap(_render_frame, frames, chunksize=chunk_size)
+
+def export_video(build_scene, frames, output_path, fps, dpi=None, codec=None, crf=None,
+                 extra_args=(), workers=None, chunk_size=None, renderer='savefig', report=False):
+    """
+    Render a scene and encode it through a single ffmpeg rawvideo pipe.
+
+    Parameters
+    ----------
+    build_scene : callable or (fig, update)
+        Picklable ``build_scene() -> (fig, update)`` (see module notes), or a
+        built ``(fig, update)`` pair, which is always rendered serially.
+    frames : sequence of int
+        Frames to render, in output order.
+    output_path : str
+        Video file to write.
+    fps : float
+        Frames per second.
+    dpi, codec, crf, extra_args :
+        Rendering dpi and encoder settings, see ``ffmpeg_command``.
+    workers : int, optional
+        Number of render processes (``None``: all cores, 1: serial).
+    chunk_size : int, optional
+        Contiguous frames handed to a worker at a time.
+    renderer : str
+        'savefig' (identical to FFMpegWriter) or 'agg' (raw canvas buffer).
+    report : bool
+        Print the frame throughput when done.
+
+    Returns
+    -------
+    stats : dict
+        ``frames``, ``seconds`` (wall time), ``fps`` (frames per second),
+        ``render_seconds`` and ``encode_seconds`` (time spent producing
+        frames and blocked writing them to ffmpeg).
+    """
+    codec = codec or mpl.rcParams['animation.codec']
+    start = time.perf_counter()
+    rendered = iter_rendered_frames(build_scene, frames, dpi, codec, workers, chunk_size, renderer)
+    frame_size = next(rendered)
+    proc = subprocess.Popen(ffmpeg_command(output_path, frame_size, fps, codec, crf, extra_args),
+                            stdin=subprocess.PIPE)
+    n_frames = 0
+    render_seconds = encode_seconds = 0.0
+    try:
+        while True:
+            t0 = time.perf_counter()
+            frame = next(rendered, None)
+            t1 = time.perf_counter()
+            if frame is None:
+                break
+            proc.stdin.write(frame)
+            encode_seconds += time.perf_counter() - t1
+            render_seconds += t1 - t0
+            n_frames += 1
+    finally:
+        proc.stdin.close()
+        rendered.close()
+        returncode = proc.wait()
+    if returncode:
+        raise subprocess.CalledProcessError(returncode, proc.args)
+    seconds = time.perf_counter() - start
+    stats = {"frames": n_frames, "seconds": seconds, "fps": n_frames / seconds if seconds else 0.0,
+             "render_seconds": render_seconds, "encode_seconds": encode_seconds}
+    if report:
+        print(f"{output_path}: {n_frames} frames in {seconds:.2f} s "
+              f"({stats['fps']:.1f} frames/s; render {render_seconds:.2f} s, "
+              f"encode {encode_seconds:.2f} s)")
+    return stats
+
+def save_scene(build_scene, n_frames, video_file, fps, workers=None, backend='writer', codec=None, crf=None):
+    """
+    Save frames ``0..n_frames-1`` of a scene as a video, as the animate
+    functions of the atlas modules do.
+
+    Parameters
+    ----------
+    build_scene : callable
+        Picklable ``build_scene() -> (fig, update)`` (see module notes).
+    n_frames : int
+        Number of frames.
+    video_file : str
+        Video file to write.
+    fps : float
+        Frames per second.
+    workers : int, optional
+        Render on this many processes with ``export_video`` (0 uses every
+        core). ``None`` renders serially.
+    backend : str
+        'writer': matplotlib's FuncAnimation and FFMpegWriter, or
+        ``export_video`` when ``workers`` is given (the same video).
+        'pipe': ``export_video`` with the 'agg' renderer, printing the frame
+        throughput.
+    codec, crf : optional
+        Encoder codec and constant rate factor for the 'pipe' backend.
+    """
+    if backend == 'pipe' or workers is not None:
+        n_workers = 1 if workers is None else (workers or None)
+        if backend == 'pipe':
+            export_video(build_scene, range(n_frames), video_file, fps=fps, codec=codec, crf=crf,
+                         workers=n_workers, renderer='agg', report=True)
+        else:
+            export_video(build_scene, range(n_frames), video_file, fps=fps, workers=n_workers)
+        return
+    fig, update = build_scene()
+    animation = FuncAnimation(fig, update, frames=n_frames, blit=False)
+    animation.save(video_file, writer=FFMpegWriter(fps=fps))